@@ -1,172 +1,448 @@
 import mesa
-import random
 import numpy as np
-from enum import Enum
+from enum import IntEnum
 from typing import List, Dict
+import copy
+import itertools
 import os
 import time
+from collections import defaultdict
 
-from auxiliarData import linea_a_stations
-from dataIngresos import ingresos_lineaA
-from generateRandomVariable2 import create_intensity_function
+from red import red_subte
+from intensidad import matriz_intensidad, escalar_intensidad, parsear_hora, minuto_inicial_datos
+from cohortes import MotorCohortes
+from eventos import MotorEventos
+from registro import RegistroSeries, RegistroAcotado
+from fragmentos import repartir_origenes, ejecutar_fragmentos, checkpoints_fragmentos
 
-class EstadoPasajero(Enum):
-    EN_PARTIDA = "en_partida"
-    EN_VIAJE = "en_viaje"
-    EN_DESTINO = "en_destino"
+MODO_AGENTES = "agentes"
+MODO_COHORTES = "cohortes"
+MODO_EVENTOS = "eventos"
 
-class Pasajero(mesa.Agent):
-    """Agente Pasajero que viaja por la línea A del subte"""
+
+def matriz_od_uniforme(conectadas):
+    """Probabilidad de destino uniforme entre las estaciones conectadas con la de partida"""
+    cantidad = conectadas.sum(axis=1, keepdims=True)
+    return np.divide(conectadas, cantidad, out=np.zeros(conectadas.shape), where=cantidad > 0)
+
+class EstadoPasajero(IntEnum):
+    EN_PARTIDA = 0
+    EN_VIAJE = 1
+    EN_DESTINO = 2
+
+# Los pasajeros guardan el estado como entero para que las comparaciones sean baratas
+EN_PARTIDA, EN_VIAJE, EN_DESTINO = (int(estado) for estado in EstadoPasajero)
+
+class Pasajero:
+    """Agente Pasajero que viaja por la red de subte.
+
+    Usa __slots__ para ocupar poca memoria: las estaciones se guardan como ids
+    enteros de la red y el estado como entero (ver EstadoPasajero). No hereda de
+    mesa.Agent porque su __dict__ anularía el ahorro; el scheduler solo necesita
+    unique_id y step().
+    """
+
+    __slots__ = ("unique_id", "model", "estacion_partida", "estacion_destino",
+                 "estado", "longitud_viaje", "restantes", "step_creacion")
     
     def __init__(self, unique_id, model, estacion_partida, estacion_destino):
-        super().__init__(unique_id, model)
+        self.unique_id = unique_id
+        self.model = model
         self.estacion_partida = estacion_partida
         self.estacion_destino = estacion_destino
-        self.estado = EstadoPasajero.EN_PARTIDA
+        self.estado = EN_PARTIDA
+        # La longitud se calcula una sola vez; restantes es lo que falta recorrer
         self.longitud_viaje = self.calcular_longitud_viaje()
+        self.restantes = self.longitud_viaje
         self.step_creacion = model.schedule.steps
         
     def calcular_longitud_viaje(self):
         """Calcula la distancia entre estación de partida y destino"""
-        estaciones = self.model.estaciones
-        idx_partida = linea_a_stations[self.estacion_partida]
-        idx_destino = linea_a_stations[self.estacion_destino]
-        return abs(idx_destino - idx_partida)
+        return int(self.model.longitudes[self.estacion_partida, self.estacion_destino])
     
     def step(self):
         """Actualiza el estado del pasajero en cada step"""
-        if self.estado == EstadoPasajero.EN_PARTIDA:
+        if self.estado == EN_PARTIDA:
             # Espera 1 paso completo antes de salir de EN_PARTIDA
             if self.model.schedule.steps > self.step_creacion:
-                self.estado = EstadoPasajero.EN_VIAJE
+                self.estado = EN_VIAJE
+                self.model.estaciones_por_indice[self.estacion_partida].pasajeros_presentes -= 1
             
-        elif self.estado == EstadoPasajero.EN_VIAJE:
-            self.longitud_viaje -= 1
+        elif self.estado == EN_VIAJE:
+            self.restantes -= 1
             
-            if self.longitud_viaje <= 0:
-                self.estado = EstadoPasajero.EN_DESTINO
+            if self.restantes <= 0:
+                self.estado = EN_DESTINO
+                self.model.estaciones_por_indice[self.estacion_destino].pasajeros_presentes += 1
+                # Se elimina al final del step siguiente a su llegada
+                self.model.expiraciones[self.model.schedule.steps + 1].append(self)
 
 class Estacion:
-    """Representa una estación de la línea A"""
+    """Representa una estación de la red"""
     
     def __init__(self, nombre, indice, model):
         self.nombre = nombre
         self.indice = indice
         self.model = model
-        self.intensity_function = create_intensity_function(list(ingresos_lineaA[nombre]))
-        
-    def generar_cantidad_pasajeros(self):
-        """Genera cantidad aleatoria de pasajeros usando distribución de Poisson"""
-        rate = self.intensity_function[self.model.schedule.steps] 
-        return np.random.poisson(rate)
+        # Pasajeros en partida o en destino en esta estación, se actualiza en cada cambio de estado
+        self.pasajeros_presentes = 0
     
-    def crear_pasajeros(self):
-        """Crea pasajeros en esta estación"""
-        cantidad = self.generar_cantidad_pasajeros()
+    def crear_pasajeros(self, cantidades_por_destino):
+        """Crea en esta estación los pasajeros sorteados para cada destino (por índice)"""
+        cantidad = int(cantidades_por_destino.sum())
+        destinos = np.repeat(np.arange(len(cantidades_por_destino)), cantidades_por_destino).tolist()
         
-        for _ in range(cantidad):
-            # Asignar destino aleatorio (diferente a la estación de partida)
-            destinos_posibles = [est for est in self.model.estaciones if est != self.nombre]
-            destino = random.choice(destinos_posibles)
-            
+        for destino in destinos:
             # Crear pasajero
             self.model.contador_pasajeros += 1
             pasajero = Pasajero(
                 unique_id=self.model.contador_pasajeros,
                 model=self.model,
-                estacion_partida=self.nombre,
+                estacion_partida=self.indice,
                 estacion_destino=destino
             )
             
             # Agregar al scheduler
             self.model.schedule.add(pasajero)
+
+        self.pasajeros_presentes += cantidad
     
     def contar_pasajeros(self):
-        """Cuenta pasajeros en esta estación según las reglas especificadas"""
-        count = 0
-        
-        for agente in self.model.schedule.agents:
-            if isinstance(agente, Pasajero):
-                # Pasajeros en partida desde esta estación
-                if (agente.estacion_partida == self.nombre and 
-                    agente.estado == EstadoPasajero.EN_PARTIDA):
-                    count += 1
-                
-                # Pasajeros que llegaron a destino en esta estación
-                elif (agente.estacion_destino == self.nombre and 
-                      agente.longitud_viaje == 0 and 
-                      agente.estado == EstadoPasajero.EN_DESTINO):
-                    count += 1
-        
-        return count
+        """Cuenta pasajeros en esta estación: en partida desde ella o que llegaron a destino en ella"""
+        return self.pasajeros_presentes
 
 class ModeloSubte(mesa.Model):
-    """Modelo principal de simulación del subte"""
+    """Modelo principal de simulación del subte
+
+    modo:
+    - "agentes": un agente Pasajero por cada pasajero
+    - "cohortes": pasajeros agrupados como conteos en arreglos de NumPy
+    - "eventos": avance al próximo evento, sin recorrer los instantes sin llegadas (ver MotorEventos)
+
+    semilla: entero, SeedSequence o Generator para que la corrida sea reproducible
+    multiplicador_demanda: factor que escala los ingresos de todas las estaciones
+    minutos_por_step: minutos que representa cada step
+    hora_inicio: hora del primer step ("08:00"); None empieza con el comienzo de los datos
+    dias: días que cubre la intensidad precalculada
+    fecha_inicio: fecha del primer día ("2024-01-01"); cada día usa el perfil de ingresos de su
+        tipo (hábil, sábado, domingo o feriado). None usa el mismo perfil para todos los días
+    ciclico: pasado ese horizonte se repite la intensidad; si es False ya no llegan pasajeros
+    matriz_od: probabilidad de cada destino (columnas) según la estación de partida (filas);
+        None usa destinos uniformes salvo la propia estación
+    lineas: líneas de la red a simular, por ejemplo ("A", "B", "C")
+    directorio_registro: si se indica, la serie se vuelca a disco por bloques (ver RegistroSeries)
+    capacidad_historia: si se indica, solo se guardan esa cantidad de steps más resúmenes por
+        hora y por día, con memoria constante (ver RegistroAcotado)
+    resolucion: en modo eventos, minutos de cada instante de llegada (divisor de minutos_por_step);
+        None usa minutos_por_step
+    intervalo_trenes: en modo eventos, minutos entre trenes; los pasajeros salen en el próximo
+        tren en lugar de esperar un step
+    instrumentacion: Instrumentacion que mide cada step (ver instrumentacion.py); None no mide nada
+    fragmentos: si es mayor a 1, la corrida se reparte por estación de origen entre procesos
+        (ver fragmentos.py); el resultado depende solo de la semilla y de la cantidad de fragmentos
+    procesos: procesos para los fragmentos; None usa todos los núcleos
+    origenes: ids de las únicas estaciones que generan pasajeros; None son todas
+    """
     
-    def __init__(self):
+    def __init__(self, modo=MODO_AGENTES, semilla=None, multiplicador_demanda=1.0,
+                 minutos_por_step=5, hora_inicio=None, dias=1, ciclico=True, matriz_od=None,
+                 directorio_registro=None, lineas=("A",), resolucion=None, intervalo_trenes=None,
+                 instrumentacion=None, fragmentos=1, procesos=None, origenes=None,
+                 fecha_inicio=None, capacidad_historia=None):
         super().__init__()
 
-        self.estaciones = linea_a_stations
+        # Parámetros con los que se reconstruye el modelo al restaurar un checkpoint
+        self.configuracion = dict(modo=modo, multiplicador_demanda=multiplicador_demanda,
+                                  minutos_por_step=minutos_por_step, hora_inicio=hora_inicio, dias=dias,
+                                  ciclico=ciclico, matriz_od=matriz_od, lineas=tuple(lineas),
+                                  resolucion=resolucion, intervalo_trenes=intervalo_trenes,
+                                  fragmentos=fragmentos, procesos=procesos, origenes=origenes,
+                                  fecha_inicio=fecha_inicio, capacidad_historia=capacidad_historia)
+
+        # Generador propio de la corrida; también fija el orden de activación de los agentes
+        self.rng = np.random.default_rng(semilla)
+        self.reset_randomizer(int(self.rng.integers(2**63)))
+
+        if modo not in (MODO_AGENTES, MODO_COHORTES, MODO_EVENTOS):
+            raise ValueError(f"Modo de simulación desconocido: {modo}")
+        if fragmentos > 1 and instrumentacion is not None:
+            # Las fases se ejecutan dentro de cada fragmento, no en este modelo
+            raise ValueError("La instrumentación no está disponible con fragmentos.")
+        self.modo = modo
+
+        # Red de estaciones con ids enteros y longitudes de viaje precalculadas
+        self.red = red_subte(tuple(lineas))
+        self.estaciones = self.red.estaciones
+        self.nombres_estaciones = self.red.nombres
+        self.longitudes = self.red.longitudes
+        self.multiplicador_demanda = multiplicador_demanda
+
+        self.minutos_por_step = minutos_por_step
+        self.minuto_inicial = parsear_hora(hora_inicio) if hora_inicio is not None else minuto_inicial_datos(self.red.lineas)
+        self.ciclico = ciclico
+        self.fecha_inicio = fecha_inicio
+
+        # Tasa de llegada por estación (filas, según su índice) y step (columnas), compartida entre
+        # modelos con el mismo multiplicador de demanda
+        n = len(self.nombres_estaciones)
+        self.intensidades = escalar_intensidad(
+            matriz_intensidad(self.nombres_estaciones, self.red.lineas, minutos_por_step, self.minuto_inicial, dias,
+                              fecha_inicio),
+            multiplicador_demanda)
+        self._sin_demanda = np.zeros(n)
+
+        # Solo generan pasajeros las estaciones de origenes (por ejemplo, las de un fragmento)
+        self.mascara_origenes = None
+        if origenes is not None:
+            self.mascara_origenes = np.zeros(n)
+            self.mascara_origenes[list(origenes)] = 1
+            self.intensidades = self.intensidades * self.mascara_origenes[:, None]
+            self.intensidades.flags.writeable = False
+
+        conectadas = self.red.conectadas()
+        self.matriz_od = matriz_od_uniforme(conectadas) if matriz_od is None else np.asarray(matriz_od, dtype=np.float64)
+        if (self.matriz_od.shape != (n, n) or (self.matriz_od < 0).any() or self.matriz_od[~conectadas].any()
+                or not np.allclose(self.matriz_od.sum(axis=1), 1)):
+            raise ValueError("La matriz O-D debe ser de estaciones × estaciones, con probabilidad nula para la "
+                             "propia estación y las no conectadas, y filas que sumen 1.")
         
         # Crear objetos estación
         self.objetos_estaciones = {nombre: Estacion(nombre, indice, self) for nombre, indice in self.estaciones.items()}
+        self.estaciones_por_indice = [self.objetos_estaciones[nombre] for nombre in self.nombres_estaciones]
         
         # Scheduler para los agentes
         self.schedule = mesa.time.RandomActivation(self)
         
         # Contador de pasajeros únicos
         self.contador_pasajeros = 0
+
+        # Pasajeros a eliminar agrupados por el step en que deben eliminarse
+        self.expiraciones = defaultdict(list)
+
+        # En modo cohortes y eventos los pasajeros no son agentes y el scheduler solo lleva los steps
+        self.motor = None
+        if modo == MODO_COHORTES:
+            self.motor = MotorCohortes(self)
+        elif modo == MODO_EVENTOS:
+            self.motor = MotorEventos(self, resolucion, intervalo_trenes, dias, multiplicador_demanda)
         
         # Estadísticas simplificadas
         self.pasajeros_por_estacion = {estacion: 0 for estacion in list(self.estaciones.keys())}
+        self.conteos = np.zeros(n, dtype=np.int64)
         
-        # Data collector simplificado - solo para mostrar en tiempo real
-        self.datacollector = mesa.DataCollector(
-            model_reporters={
-                "Step": lambda m: m.schedule.steps,
-                **{f"Estacion_{estacion}": lambda m, est=estacion: m.pasajeros_por_estacion[est] 
-                   for estacion in list(self.estaciones.keys())}
-            }
-        )
-        self.data = []
+        # Serie de pasajeros por estación, una fila por step
+        if capacidad_historia is not None:
+            self.registro = RegistroAcotado(self.nombres_estaciones, capacidad_historia, self.minuto_inicial, minutos_por_step)
+        else:
+            self.registro = RegistroSeries(self.nombres_estaciones, directorio_volcado=directorio_registro)
+
+        # Con fragmentos, este modelo solo junta las series; cada fragmento es otro modelo
+        self.fragmentos = fragmentos
+        self.procesos = procesos
+        if fragmentos > 1:
+            self.origenes_fragmentos = repartir_origenes(self.intensidades.sum(axis=1), fragmentos)
+            self.semillas_fragmentos = self.rng.bit_generator.seed_seq.spawn(fragmentos)
+            self.checkpoints_fragmentos = [None] * fragmentos
+            # Semillas nuevas para los fragmentos restaurados de un checkpoint (ver restaurar_checkpoint)
+            self.resiembras_fragmentos = None
+            # Los procesos de los fragmentos se crean en el primer step (ver EjecutorFragmentos)
+            self.ejecutor_fragmentos = None
+
+        self.instrumentacion = None
+        if instrumentacion is not None:
+            instrumentacion.instalar(self)
+
+    @property
+    def data(self):
+        """Serie completa como lista de diccionarios {estación: pasajeros}, uno por step"""
+        return [dict(zip(self.nombres_estaciones, fila)) for fila in self.registro.serie_completa().tolist()]
     
     def actualizar_estadisticas(self):
         """Actualiza estadísticas de pasajeros por estación"""
-        for estacion_nombre, estacion_obj in self.objetos_estaciones.items():
-            self.pasajeros_por_estacion[estacion_nombre] = estacion_obj.contar_pasajeros()
+        if self.motor is not None:
+            self.conteos = self.motor.contar_pasajeros()
+        else:
+            self.conteos = np.array([estacion.contar_pasajeros() for estacion in self.estaciones_por_indice])
+
+        for estacion_nombre, cantidad in zip(self.nombres_estaciones, self.conteos.tolist()):
+            self.pasajeros_por_estacion[estacion_nombre] = cantidad
 
     
+    def intensidad_actual(self):
+        """Tasa de llegada de cada estación en el step actual"""
+        columna = self.schedule.steps
+        if columna >= self.intensidades.shape[1]:
+            if not self.ciclico:
+                return self._sin_demanda
+            columna %= self.intensidades.shape[1]
+        return self.intensidades[:, columna]
+
+    def generar_llegadas(self):
+        """Sortea en bloque los pasajeros nuevos del step: cantidad por estación (Poisson)
+        y su reparto por destino según la matriz O-D. Devuelve la matriz origen × destino."""
+        cantidades = self.rng.poisson(self.intensidad_actual())
+        return self.rng.multinomial(cantidades, self.matriz_od)
+
+    def crear_pasajeros(self):
+        """Crea los pasajeros nuevos en todas las estaciones"""
+        if self.modo == MODO_EVENTOS:
+            # El motor de eventos sortea las llegadas a medida que ocurren
+            self.motor.crear_pasajeros()
+            return
+
+        llegadas = self.generar_llegadas()
+        if self.motor is not None:
+            self.motor.crear_pasajeros(llegadas)
+            self.contador_pasajeros += int(llegadas.sum())
+        else:
+            for estacion in self.objetos_estaciones.values():
+                estacion.crear_pasajeros(llegadas[estacion.indice])
+
+    def avanzar_pasajeros(self):
+        """Actualiza todos los agentes (o las cohortes) y avanza el contador de steps"""
+        if self.motor is not None:
+            self.motor.avanzar()
+        self.schedule.step()
+
+    def cantidad_pasajeros(self):
+        """Pasajeros activos en el modelo"""
+        if self.motor is not None:
+            return self.motor.cantidad_pasajeros()
+        return self.schedule.get_agent_count()
+
+    def recolectar_datos(self):
+        """Guarda las estadísticas del step actual"""
+        self.registro.registrar(self.conteos)
+
+    def fases(self):
+        """Fases de un step en orden de ejecución, como pares (nombre, función)"""
+        return [
+            ("creacion", self.crear_pasajeros),
+            ("schedule", self.avanzar_pasajeros),
+            ("estadisticas", self.actualizar_estadisticas),
+            ("recoleccion", self.recolectar_datos),
+            ("limpieza", self.limpiar_pasajeros_finalizados),
+        ]
+
     def step(self):
         """Ejecuta un paso de la simulación"""
+        if self.fragmentos > 1:
+            ejecutar_fragmentos(self, 1)
+            return
+
+        if self.instrumentacion is not None:
+            # Las mismas fases, medidas una por una
+            self.instrumentacion.medir_step(self)
+            return
+
         # Crear pasajeros en todas las estaciones
-        for estacion in self.objetos_estaciones.values():
-            estacion.crear_pasajeros()
+        self.crear_pasajeros()
         
         # Actualizar todos los agentes
-        self.schedule.step()
+        self.avanzar_pasajeros()
         
         # Actualizar estadísticas
         self.actualizar_estadisticas()
         
         # Recopilar datos
-        self.datacollector.collect(self)
+        self.recolectar_datos()
         
         # Limpiar pasajeros que completaron su viaje
         self.limpiar_pasajeros_finalizados()
-        self.data.append(self.pasajeros_por_estacion.copy())
     
+    def ejecutar(self, steps):
+        """Ejecuta `steps` steps; con fragmentos, cada proceso avanza todos los steps de una vez"""
+        if self.fragmentos > 1:
+            ejecutar_fragmentos(self, steps)
+            return
+        for _ in range(steps):
+            self.step()
+
+    def iter_steps(self, steps=None):
+        """Generador que ejecuta un step por iteración y devuelve (step, conteos), con los
+        conteos en el orden de nombres_estaciones. Sin steps no termina."""
+        for _ in (itertools.count() if steps is None else range(steps)):
+            self.step()
+            yield self.schedule.steps, self.conteos.copy()
+
     def limpiar_pasajeros_finalizados(self):
         """Elimina pasajeros que han llegado a su destino (después de 1 step en destino)"""
-        pasajeros_a_eliminar = []
-        
-        for agente in self.schedule.agents:
-            if isinstance(agente, Pasajero):
-                if (agente.estado == EstadoPasajero.EN_DESTINO and 
-                    self.schedule.steps - agente.step_creacion > agente.calcular_longitud_viaje() + 1):
-                    pasajeros_a_eliminar.append(agente)
-        
-        for pasajero in pasajeros_a_eliminar:
+        for pasajero in self.expiraciones.pop(self.schedule.steps, []):
             self.schedule.remove(pasajero)
+            self.estaciones_por_indice[pasajero.estacion_destino].pasajeros_presentes -= 1
+
+    def obtener_estado(self):
+        """Estado completo del modelo entre dos steps (ver checkpoint.py): pasajeros en curso,
+        contadores, estado de los generadores aleatorios y número de step"""
+        estado = {
+            "step": self.schedule.steps,
+            "tiempo": self.schedule.time,
+            "rng": self.rng.bit_generator.state,
+            "random": self.random.getstate(),
+            "contador_pasajeros": self.contador_pasajeros,
+            "conteos": self.conteos.copy(),
+        }
+        if isinstance(self.registro, RegistroAcotado):
+            # Es de tamaño fijo: se guarda entero, con sus resúmenes y la numeración de steps
+            estado["registro"] = copy.deepcopy(self.registro)
+        else:
+            estado["serie"] = np.array(self.registro.serie_completa())
+        if self.fragmentos > 1:
+            estado["fragmentos"] = checkpoints_fragmentos(self)
+            return estado
+        if self.motor is not None:
+            estado["motor"] = self.motor.obtener_estado()
+            return estado
+
+        # Agentes como columnas, en el orden del scheduler para que el orden de activación se repita
+        pasajeros = self.schedule.agents
+        expiracion = {pasajero.unique_id: step for step, lista in self.expiraciones.items() for pasajero in lista}
+        estado["pasajeros"] = np.array(
+            [(p.unique_id, p.estacion_partida, p.estacion_destino, p.estado, p.restantes, p.step_creacion,
+              expiracion.get(p.unique_id, -1)) for p in pasajeros], dtype=np.int64).reshape(-1, 7)
+        estado["presentes"] = np.array([estacion.pasajeros_presentes for estacion in self.estaciones_por_indice])
+        return estado
+
+    def cargar_estado(self, estado):
+        """Reemplaza el estado de un modelo recién creado con la misma configuración"""
+        self.schedule.steps = estado["step"]
+        self.schedule.time = estado["tiempo"]
+        self.rng.bit_generator.state = estado["rng"]
+        self.random.setstate(estado["random"])
+        self.contador_pasajeros = estado["contador_pasajeros"]
+        self.conteos = estado["conteos"].copy()
+        self.pasajeros_por_estacion = dict(zip(self.nombres_estaciones, self.conteos.tolist()))
+        if "registro" in estado:
+            self.registro = copy.deepcopy(estado["registro"])
+        else:
+            for fila in estado["serie"]:
+                self.registro.registrar(fila)
+
+        if self.fragmentos > 1:
+            self.checkpoints_fragmentos = list(estado["fragmentos"])
+            return
+        if self.motor is not None:
+            self.motor.cargar_estado(estado["motor"])
+            return
+
+        for unique_id, partida, destino, estado_pasajero, restantes, step_creacion, expira in estado["pasajeros"].tolist():
+            pasajero = Pasajero(unique_id, self, partida, destino)
+            pasajero.estado = estado_pasajero
+            pasajero.restantes = restantes
+            pasajero.step_creacion = step_creacion
+            self.schedule.add(pasajero)
+            if expira >= 0:
+                self.expiraciones[expira].append(pasajero)
+        for estacion, presentes in zip(self.estaciones_por_indice, estado["presentes"].tolist()):
+            estacion.pasajeros_presentes = presentes
+
+    def cerrar(self):
+        """Detiene los procesos de los fragmentos, si los hay; el próximo step los vuelve a
+        crear desde donde quedaron"""
+        if self.fragmentos > 1 and self.ejecutor_fragmentos is not None:
+            self.checkpoints_fragmentos = checkpoints_fragmentos(self)
+            self.ejecutor_fragmentos.cerrar()
+            self.ejecutor_fragmentos = None
 
     def obtener_estado_tiempo_real(self):
         """Obtiene el estado actual para mostrar en tiempo real"""
@@ -176,41 +452,40 @@ class ModeloSubte(mesa.Model):
         }
 
 # Ejemplo de uso
+if __name__ == "__main__":
+    modelo = ModeloSubte()
 
+    for i in range(0, 10):
+        modelo.step()
+        estado = modelo.obtener_estado_tiempo_real()
+    """
+    print("Iniciando simulación de la Línea A del Subte...")
+    print("=" * 60)
 
-modelo = ModeloSubte()
+    time.sleep(1)
+    os.system('cls')
 
-for i in range(0, 10):
     modelo.step()
     estado = modelo.obtener_estado_tiempo_real()
-"""
-print("Iniciando simulación de la Línea A del Subte...")
-print("=" * 60)
-
-time.sleep(1)
-os.system('cls')
+    estaciones = list(estado['pasajeros_por_estacion'].keys())
 
-modelo.step()
-estado = modelo.obtener_estado_tiempo_real()
-estaciones = list(estado['pasajeros_por_estacion'].keys())
 
-
-for i in range(1, 100):
-    modelo.step()
-    estado = modelo.obtener_estado_tiempo_real()
+    for i in range(1, 100):
+        modelo.step()
+        estado = modelo.obtener_estado_tiempo_real()
     
-    os.system('cls')
+        os.system('cls')
     
-    # Construir todo de una vez usando list comprehension
-    lines = [f"\nStep {estado['step']}:", "-" * 40]
-    lines.extend(f"  {est:<25}: {estado['pasajeros_por_estacion'][est]:>3} pasajeros" 
-                for est in estaciones)
-    lines.extend(["-" * 40, 
-                 f"  {'TOTAL':<25}: {sum(estado['pasajeros_por_estacion'].values()):>3} pasajeros"])
+        # Construir todo de una vez usando list comprehension
+        lines = [f"\nStep {estado['step']}:", "-" * 40]
+        lines.extend(f"  {est:<25}: {estado['pasajeros_por_estacion'][est]:>3} pasajeros" 
+                    for est in estaciones)
+        lines.extend(["-" * 40, 
+                     f"  {'TOTAL':<25}: {sum(estado['pasajeros_por_estacion'].values()):>3} pasajeros"])
     
-    print('\n'.join(lines))
-    time.sleep(1)
+        print('\n'.join(lines))
+        time.sleep(1)
 
-print("\n" + "=" * 60)
-print("Simulación completada")
-"""
\ No newline at end of file
+    print("\n" + "=" * 60)
+    print("Simulación completada")
+    """
@@ -47,4 +47,12 @@ linea_c_stations = {
     "Retiro": 7
 }
 
-lineas_aux_data = [linea_a_stations, linea_b_stations, linea_c_stations]
\ No newline at end of file
+lineas_aux_data = [linea_a_stations, linea_b_stations, linea_c_stations]
+
+nombres_lineas = ["A", "B", "C"]
+
+# Combinaciones entre estaciones de distintas líneas
+transbordos = [
+    ("Lima", "Avenida de Mayo"),
+    ("Carlos Pellegrini", "Diagonal Norte"),
+]
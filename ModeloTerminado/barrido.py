@@ -0,0 +1,200 @@
+"""Barridos de escenarios reanudables.
+
+Expande una grilla de parámetros de ModeloSubte (multiplicador de demanda,
+minutos por step, líneas, ...) y cada combinación con cada semilla forma un
+escenario. Cada escenario se identifica con el hash de su configuración,
+semilla, cantidad de steps y datos de ingresos (al ingerir otro CSV los
+resultados anteriores dejan de coincidir). Los resultados se guardan en un único archivo
+SQLite indexado por esa clave: la serie steps × estaciones va comprimida en
+una columna binaria junto a columnas con los parámetros y totales.
+
+Antes de ejecutar se omiten las claves que ya están en el archivo, y cada
+resultado se guarda apenas termina. Un barrido interrumpido o una grilla
+ampliada retoma exactamente desde lo que falta.
+
+Uso:
+    python -m barrido --grilla grilla.json --semillas 1 2 3 --steps 288 --salida barrido.sqlite
+
+donde grilla.json es, por ejemplo:
+    {"multiplicador_demanda": [0.5, 1, 2], "minutos_por_step": [5, 15], "lineas": [["A"], ["A", "B", "C"]]}
+"""
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Cambiarla invalida los resultados guardados (por ejemplo, si cambia el modelo)
+VERSION_RESULTADOS = 1
+
+
+def expandir_grilla(grilla):
+    """Todas las combinaciones de {parámetro: [valores]} como lista de diccionarios"""
+    nombres = sorted(grilla)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*(grilla[nombre] for nombre in nombres))]
+
+
+def _normalizar(valor):
+    """Misma representación para valores equivalentes: 1 y 1.0, tuplas y listas"""
+    if isinstance(valor, dict):
+        return {clave: _normalizar(elemento) for clave, elemento in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(elemento) for elemento in valor]
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return float(valor)
+    return valor
+
+
+def clave_escenario(configuracion, semilla, steps, demanda):
+    """Hash estable de la configuración, la semilla, los steps y los datos de ingresos
+    (ver ingesta.origen_demanda)"""
+    contenido = json.dumps({"version": VERSION_RESULTADOS, "configuracion": _normalizar(configuracion),
+                            "semilla": semilla, "steps": steps, "demanda": demanda}, sort_keys=True)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def ejecutar_escenario(configuracion, semilla, steps):
+    """Ejecuta un escenario y devuelve las estaciones, la serie y el tiempo de simulación"""
+    from Model import ModeloSubte
+
+    parametros = dict(configuracion)
+    if "lineas" in parametros:
+        parametros["lineas"] = tuple(parametros["lineas"])
+
+    inicio = time.perf_counter()
+    modelo = ModeloSubte(semilla=semilla, **parametros)
+    for _ in range(steps):
+        modelo.step()
+    return {
+        "estaciones": list(modelo.registro.estaciones),
+        "serie": np.array(modelo.registro.serie_completa()),
+        "pasajeros": modelo.contador_pasajeros,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def _serie_a_bytes(serie):
+    buffer = io.BytesIO()
+    np.save(buffer, serie, allow_pickle=False)
+    return zlib.compress(buffer.getvalue())
+
+
+def _bytes_a_serie(datos):
+    return np.load(io.BytesIO(zlib.decompress(datos)), allow_pickle=False)
+
+
+class AlmacenResultados:
+    """Archivo SQLite con un resultado por escenario, indexado por su clave"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                clave TEXT PRIMARY KEY,
+                configuracion TEXT NOT NULL,
+                semilla INTEGER,
+                steps INTEGER NOT NULL,
+                estaciones TEXT NOT NULL,
+                serie BLOB NOT NULL,
+                pasajeros INTEGER NOT NULL,
+                segundos REAL NOT NULL
+            )""")
+        self.conexion.commit()
+
+    def claves(self):
+        return {clave for (clave,) in self.conexion.execute("SELECT clave FROM resultados")}
+
+    def guardar(self, clave, configuracion, semilla, steps, resultado):
+        # Cada resultado se confirma por separado para que una interrupción no pierda los anteriores
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (clave, json.dumps(configuracion, sort_keys=True), semilla, steps,
+                 json.dumps(resultado["estaciones"], ensure_ascii=False), _serie_a_bytes(resultado["serie"]),
+                 int(resultado["pasajeros"]), resultado["segundos"]))
+
+    def leer(self, clave):
+        """Resultado de un escenario, o None si no está"""
+        fila = self.conexion.execute("SELECT * FROM resultados WHERE clave = ?", (clave,)).fetchone()
+        return None if fila is None else self._como_resultado(fila)
+
+    def resultados(self):
+        """Todos los resultados guardados"""
+        return [self._como_resultado(fila) for fila in self.conexion.execute("SELECT * FROM resultados")]
+
+    @staticmethod
+    def _como_resultado(fila):
+        clave, configuracion, semilla, steps, estaciones, serie, pasajeros, segundos = fila
+        return {
+            "clave": clave,
+            "configuracion": json.loads(configuracion),
+            "semilla": semilla,
+            "steps": steps,
+            "estaciones": json.loads(estaciones),
+            "serie": _bytes_a_serie(serie),
+            "pasajeros": pasajeros,
+            "segundos": segundos,
+        }
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+def ejecutar_barrido(grilla, semillas, steps, ruta, procesos=None):
+    """Ejecuta los escenarios de la grilla que no estén en el archivo `ruta`.
+    Devuelve la cantidad de escenarios totales, ya existentes y ejecutados."""
+    from ingesta import origen_demanda
+
+    demanda = origen_demanda()
+    escenarios = [(clave_escenario(configuracion, semilla, steps, demanda), configuracion, semilla)
+                  for configuracion in expandir_grilla(grilla) for semilla in semillas]
+
+    almacen = AlmacenResultados(ruta)
+    try:
+        existentes = almacen.claves()
+        pendientes = [escenario for escenario in escenarios if escenario[0] not in existentes]
+        procesos = procesos or os.cpu_count()
+
+        if procesos == 1:
+            for clave, configuracion, semilla in pendientes:
+                almacen.guardar(clave, configuracion, semilla, steps, ejecutar_escenario(configuracion, semilla, steps))
+        elif pendientes:
+            with ProcessPoolExecutor(max_workers=min(procesos, len(pendientes))) as pool:
+                futuros = {pool.submit(ejecutar_escenario, configuracion, semilla, steps): (clave, configuracion, semilla)
+                           for clave, configuracion, semilla in pendientes}
+                for futuro in as_completed(futuros):
+                    clave, configuracion, semilla = futuros[futuro]
+                    almacen.guardar(clave, configuracion, semilla, steps, futuro.result())
+    finally:
+        almacen.cerrar()
+
+    return {"total": len(escenarios), "existentes": len(escenarios) - len(pendientes), "ejecutados": len(pendientes)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="barrido", description="Barrido reanudable de escenarios de ModeloSubte")
+    parser.add_argument("--grilla", required=True, help="archivo JSON con {parámetro: [valores]}")
+    parser.add_argument("--semillas", nargs="+", type=int, required=True)
+    parser.add_argument("--steps", type=int, required=True)
+    parser.add_argument("--salida", required=True, help="archivo SQLite de resultados")
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.grilla, encoding="utf-8") as archivo:
+        grilla = json.load(archivo)
+
+    resumen = ejecutar_barrido(grilla, args.semillas, args.steps, args.salida, args.procesos)
+    print(f"{resumen['total']} escenarios: {resumen['existentes']} ya calculados, {resumen['ejecutados']} ejecutados")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+"""Benchmark de rendimiento de ModeloSubte.step().
+
+Ejecuta el modelo con semillas y horizontes fijos para varios multiplicadores
+de demanda y mide, por caso:
+- pasajeros creados por segundo
+- tiempo total de cada fase del step (ver ModeloSubte.fases)
+- pico de memoria residente (RSS) del proceso
+
+Además mide la memoria por agente Pasajero (incluida su entrada en el
+scheduler), para dimensionar los procesos que corren en modo agentes.
+
+Cada caso corre en un proceso nuevo para que el pico de memoria sea propio.
+
+Con --muestreo solo compara el muestreo de la distribución empírica de
+ingresos: rv_discrete de a un valor contra las tablas de alias en bloque.
+
+Uso:
+    python -m benchmark                      # compara contra benchmark_baseline.json
+    python -m benchmark --guardar-base       # guarda los resultados como nueva base
+    python -m benchmark --umbral 0.1         # tolera hasta un 10% de empeoramiento
+    python -m benchmark --muestreo           # rv_discrete contra método de alias
+
+Si algún caso empeora más que el umbral respecto de la base, el comando
+termina con código de salida 1. También si no existe la base, salvo que se
+indique --sin-base.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+RUTA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+MODOS = ["agentes", "cohortes", "eventos"]
+MULTIPLICADORES = [0.5, 1.0, 2.0]
+SEMILLAS = [1, 2]
+STEPS = 100
+UMBRAL = 0.2
+AGENTES_MEDICION_MEMORIA = 100_000
+MUESTRAS_ESCALARES = 2_000
+MUESTRAS_ALIAS = 1_000_000
+
+
+def pico_memoria_mb():
+    """Pico de memoria residente del proceso actual en MB"""
+    try:
+        import resource
+    except ImportError:
+        # En Windows no existe resource; psutil da el pico del working set
+        import psutil
+        memoria = psutil.Process().memory_info()
+        return getattr(memoria, "peak_wset", memoria.rss) / 2**20
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+
+def ejecutar_caso(modo, multiplicador, semilla, steps):
+    """Ejecuta un caso midiendo el tiempo de cada fase del step"""
+    from Model import ModeloSubte
+
+    modelo = ModeloSubte(modo=modo, semilla=semilla, multiplicador_demanda=multiplicador)
+    fases = modelo.fases()
+    tiempos = {nombre: 0.0 for nombre, _ in fases}
+
+    inicio = time.perf_counter()
+    for _ in range(steps):
+        for nombre, fase in fases:
+            inicio_fase = time.perf_counter()
+            fase()
+            tiempos[nombre] += time.perf_counter() - inicio_fase
+    tiempo_total = time.perf_counter() - inicio
+
+    return {
+        "modo": modo,
+        "multiplicador": multiplicador,
+        "semilla": semilla,
+        "steps": steps,
+        "pasajeros": modelo.contador_pasajeros,
+        "pasajeros_por_segundo": modelo.contador_pasajeros / tiempo_total,
+        "tiempo_total_s": tiempo_total,
+        "tiempo_fases_s": tiempos,
+        "pico_memoria_mb": pico_memoria_mb(),
+    }
+
+
+def medir_memoria_por_agente(cantidad=AGENTES_MEDICION_MEMORIA):
+    """Bytes asignados por cada Pasajero creado, incluida su entrada en el scheduler"""
+    import numpy as np
+    from Model import ModeloSubte
+
+    modelo = ModeloSubte(semilla=0)
+    estacion = modelo.estaciones_por_indice[0]
+    cantidades_por_destino = np.zeros(len(modelo.estaciones), dtype=np.int64)
+    cantidades_por_destino[-1] = cantidad
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    estacion.crear_pasajeros(cantidades_por_destino)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (despues - antes) / cantidad
+
+
+def medir_muestreo(muestras_escalares=MUESTRAS_ESCALARES, muestras_alias=MUESTRAS_ALIAS, estacion="Plaza de Mayo"):
+    """Valores por segundo de generar_ingreso_pasajeros (rv_discrete) y de muestrear_ingresos (alias)"""
+    import numpy as np
+    from generateRandomVariable import generar_ingreso_pasajeros, muestrear_ingresos, tablas_alias
+
+    # Las distribuciones se construyen antes de medir en ambos casos
+    generar_ingreso_pasajeros(estacion)
+    tablas_alias()
+    rng = np.random.default_rng(0)
+
+    inicio = time.perf_counter()
+    for _ in range(muestras_escalares):
+        generar_ingreso_pasajeros(estacion)
+    escalar = muestras_escalares / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    muestrear_ingresos(estacion, muestras_alias, rng)
+    alias = muestras_alias / (time.perf_counter() - inicio)
+
+    return {"rv_discrete_por_segundo": escalar, "alias_por_segundo": alias, "aceleracion": alias / escalar}
+
+
+def clave_caso(caso):
+    return f"{caso['modo']}-x{caso['multiplicador']}-s{caso['semilla']}-{caso['steps']}"
+
+
+def ejecutar_benchmark(modos=MODOS, multiplicadores=MULTIPLICADORES, semillas=SEMILLAS, steps=STEPS):
+    resultados = {}
+    for modo in modos:
+        for multiplicador in multiplicadores:
+            for semilla in semillas:
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    caso = pool.submit(ejecutar_caso, modo, multiplicador, semilla, steps).result()
+                resultados[clave_caso(caso)] = caso
+                print(f"{clave_caso(caso):<28} {caso['pasajeros_por_segundo']:>12.0f} pasajeros/s "
+                      f"{caso['tiempo_total_s']:>8.3f}s {caso['pico_memoria_mb']:>8.1f} MB")
+    return resultados
+
+
+def comparar_con_base(resultados, base, umbral=UMBRAL):
+    """Devuelve la lista de regresiones que superan el umbral relativo"""
+    regresiones = []
+    memoria, memoria_base = resultados["memoria_por_agente_bytes"], base.get("memoria_por_agente_bytes")
+    if memoria_base is not None and memoria > memoria_base * (1 + umbral):
+        regresiones.append(f"memoria por agente: {memoria_base:.0f} -> {memoria:.0f} bytes")
+
+    for clave, caso in resultados["casos"].items():
+        if clave not in base.get("casos", {}):
+            continue
+        referencia = base["casos"][clave]
+        if caso["pasajeros_por_segundo"] < referencia["pasajeros_por_segundo"] * (1 - umbral):
+            regresiones.append(f"{clave}: pasajeros/s {referencia['pasajeros_por_segundo']:.0f} -> {caso['pasajeros_por_segundo']:.0f}")
+        if caso["pico_memoria_mb"] > referencia["pico_memoria_mb"] * (1 + umbral):
+            regresiones.append(f"{clave}: memoria {referencia['pico_memoria_mb']:.1f} MB -> {caso['pico_memoria_mb']:.1f} MB")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Benchmark de ModeloSubte.step()")
+    parser.add_argument("--modos", nargs="+", default=MODOS, choices=MODOS)
+    parser.add_argument("--multiplicadores", nargs="+", type=float, default=MULTIPLICADORES)
+    parser.add_argument("--semillas", nargs="+", type=int, default=SEMILLAS)
+    parser.add_argument("--steps", type=int, default=STEPS)
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="empeoramiento relativo tolerado")
+    parser.add_argument("--base", default=RUTA_BASE, help="archivo JSON con la base de comparación")
+    parser.add_argument("--guardar-base", action="store_true", help="guarda los resultados como nueva base")
+    parser.add_argument("--sin-base", action="store_true", help="si no existe la base, solo mide sin comparar")
+    parser.add_argument("--muestreo", action="store_true", help="solo compara rv_discrete contra el método de alias")
+    args = parser.parse_args(argv)
+
+    if args.muestreo:
+        muestreo = medir_muestreo()
+        print(f"rv_discrete: {muestreo['rv_discrete_por_segundo']:>14.0f} valores/s")
+        print(f"alias:       {muestreo['alias_por_segundo']:>14.0f} valores/s ({muestreo['aceleracion']:.0f}x)")
+        return 0
+
+    # Sin base no hay comparación posible: se avisa antes de medir
+    sin_base = not args.guardar_base and not os.path.exists(args.base)
+    if sin_base and not args.sin_base:
+        print(f"No existe la base {args.base}; ejecutar con --guardar-base para crearla "
+              f"o con --sin-base para medir sin comparar", file=sys.stderr)
+        return 1
+
+    casos = ejecutar_benchmark(args.modos, args.multiplicadores, args.semillas, args.steps)
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        memoria_por_agente = pool.submit(medir_memoria_por_agente).result()
+    print(f"Memoria por agente Pasajero: {memoria_por_agente:.0f} bytes")
+    resultados = {"casos": casos, "memoria_por_agente_bytes": memoria_por_agente}
+
+    if args.guardar_base:
+        with open(args.base, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f"Base guardada en {args.base}")
+        return 0
+
+    if sin_base:
+        print(f"No existe la base {args.base}; resultados sin comparar")
+        return 0
+
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+
+    sin_referencia = [clave for clave in casos if clave not in base.get("casos", {})]
+    if sin_referencia:
+        print(f"Casos sin referencia en la base (no se comparan): {', '.join(sin_referencia)}")
+
+    regresiones = comparar_con_base(resultados, base, args.umbral)
+    if regresiones:
+        print(f"REGRESIÓN de rendimiento (umbral {args.umbral:.0%}):", file=sys.stderr)
+        for regresion in regresiones:
+            print(f"  {regresion}", file=sys.stderr)
+        return 1
+
+    print("Sin regresiones respecto de la base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
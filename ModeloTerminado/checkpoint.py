@@ -0,0 +1,86 @@
+"""Checkpoints del estado de ModeloSubte para retomar o bifurcar corridas.
+
+Un checkpoint son bytes (pickle comprimido con zlib) con la configuración del
+modelo y su estado entre dos steps: pasajeros en curso, contadores, estado de
+los generadores aleatorios, número de step y, opcionalmente, la serie ya
+registrada. Restaurarlo reconstruye el modelo con la misma configuración y
+continúa exactamente igual que el original.
+
+Para escenarios que comparten la mañana (un cierre a las 18:00, un aumento de
+demanda), se simula hasta el punto común una sola vez y cada rama arranca del
+mismo checkpoint:
+
+    base = guardar_checkpoint(modelo)
+    ramas = bifurcar(base, semillas=[1, 2, 3], multiplicador_demanda=1.5)
+"""
+import pickle
+import zlib
+
+import numpy as np
+
+from Model import ModeloSubte
+
+VERSION = 1
+
+# Parámetros que definen la forma del estado; no se pueden cambiar al restaurar
+PARAMETROS_ESTRUCTURALES = ("modo", "lineas", "minutos_por_step", "hora_inicio", "resolucion", "fragmentos",
+                            "origenes", "capacidad_historia")
+
+
+def guardar_checkpoint(modelo, incluir_serie=True, nivel_compresion=6):
+    """Serializa el estado del modelo. Sin incluir_serie, el modelo restaurado
+    registra solo los steps posteriores al checkpoint."""
+    estado = modelo.obtener_estado()
+    if not incluir_serie and "serie" in estado:
+        estado["serie"] = estado["serie"][:0]
+    contenido = {"version": VERSION, "configuracion": modelo.configuracion, "estado": estado}
+    return zlib.compress(pickle.dumps(contenido, protocol=pickle.HIGHEST_PROTOCOL), nivel_compresion)
+
+
+def leer_checkpoint(checkpoint):
+    """Devuelve (configuración, estado) de un checkpoint"""
+    contenido = pickle.loads(zlib.decompress(checkpoint))
+    if contenido.get("version") != VERSION:
+        raise ValueError(f"Versión de checkpoint no soportada: {contenido.get('version')}")
+    return contenido["configuracion"], contenido["estado"]
+
+
+def restaurar_checkpoint(checkpoint, semilla=None, directorio_registro=None, **cambios):
+    """Reconstruye el modelo guardado en el checkpoint.
+
+    semilla: si se indica, la rama continúa con un generador nuevo en lugar del guardado
+    cambios: parámetros del modelo a modificar en la rama, por ejemplo multiplicador_demanda
+    """
+    configuracion, estado = leer_checkpoint(checkpoint)
+    estructurales = [nombre for nombre in cambios if nombre in PARAMETROS_ESTRUCTURALES
+                     and cambios[nombre] != configuracion.get(nombre)]
+    if estructurales:
+        raise ValueError(f"No se pueden cambiar al restaurar: {', '.join(estructurales)}")
+
+    modelo = ModeloSubte(**{**configuracion, **cambios}, directorio_registro=directorio_registro)
+    modelo.cargar_estado(estado)
+
+    if semilla is not None:
+        # Igual que en ModeloSubte.__init__
+        modelo.rng = np.random.default_rng(semilla)
+        modelo.reset_randomizer(int(modelo.rng.integers(2**63)))
+        if modelo.fragmentos > 1:
+            # Este modelo no sortea: cada fragmento continúa con una semilla derivada de la nueva
+            modelo.resiembras_fragmentos = modelo.rng.bit_generator.seed_seq.spawn(modelo.fragmentos)
+    return modelo
+
+
+def bifurcar(checkpoint, semillas, **cambios):
+    """Un modelo por semilla, todos desde el mismo checkpoint. Con semilla None
+    la rama continúa igual que el modelo original."""
+    return [restaurar_checkpoint(checkpoint, semilla, **cambios) for semilla in semillas]
+
+
+def escribir_checkpoint(ruta, checkpoint):
+    with open(ruta, "wb") as archivo:
+        archivo.write(checkpoint)
+
+
+def cargar_checkpoint(ruta):
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
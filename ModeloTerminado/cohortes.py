@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class MotorCohortes:
+    """Motor que representa a los pasajeros como conteos en arreglos de NumPy
+    en lugar de un agente por pasajero.
+
+    Estados (equivalentes a EstadoPasajero):
+    - en_partida[o, d]: pasajeros que esperan en la estación de origen o
+    - en_viaje[o, d, h]: pasajeros en viaje a los que les faltan h estaciones;
+      la posición h = 0 guarda a los que están en_destino en este step
+    """
+
+    def __init__(self, model):
+        self.model = model
+
+        n = len(model.nombres_estaciones)
+
+        # Longitud de viaje entre cada par de estaciones
+        self.longitudes = model.longitudes
+        self.max_longitud = int(self.longitudes.max())
+
+        # Pares (origen, destino) válidos: destino conectado y diferente a la partida
+        self.origenes, self.destinos = np.nonzero(model.red.conectadas())
+        self.longitudes_pares = self.longitudes[self.origenes, self.destinos]
+
+        self.en_partida = np.zeros((n, n), dtype=np.int64)
+        self.en_viaje = np.zeros((n, n, self.max_longitud + 1), dtype=np.int64)
+
+        # Pasajeros creados en este step que todavía no entraron en en_partida
+        self.nuevos = np.zeros_like(self.en_partida)
+
+    def crear_pasajeros(self, nuevos):
+        """Recibe los pasajeros nuevos del step como matriz origen × destino"""
+        self.nuevos = nuevos
+
+    def avanzar(self):
+        """Avanza un step a todos los pasajeros desplazando los arreglos"""
+        # Los que estaban en_destino se descartan y a los demás les falta una estación menos
+        self.en_viaje[..., :-1] = self.en_viaje[..., 1:]
+        self.en_viaje[..., -1] = 0
+
+        # Los que estaban en_partida salen de viaje con la longitud completa
+        self.en_viaje[self.origenes, self.destinos, self.longitudes_pares] += \
+            self.en_partida[self.origenes, self.destinos]
+
+        self.en_partida = self.nuevos
+
+    def obtener_estado(self):
+        """Copia de los arreglos de pasajeros, para checkpoints"""
+        return {"en_partida": self.en_partida.copy(), "en_viaje": self.en_viaje.copy(), "nuevos": self.nuevos.copy()}
+
+    def cargar_estado(self, estado):
+        self.en_partida = estado["en_partida"].copy()
+        self.en_viaje = estado["en_viaje"].copy()
+        self.nuevos = estado["nuevos"].copy()
+
+    def contar_pasajeros(self):
+        """Pasajeros en cada estación: en_partida en el origen más en_destino en el destino"""
+        return self.en_partida.sum(axis=1) + self.en_viaje[:, :, 0].sum(axis=0)
+
+    def cantidad_pasajeros(self):
+        """Cantidad total de pasajeros activos en el modelo (los que están en_destino
+        ya fueron contabilizados y se eliminan, como en limpiar_pasajeros_finalizados)"""
+        return int(self.en_partida.sum() + self.en_viaje[..., 1:].sum())
@@ -0,0 +1,49 @@
+"""Valor esperado exacto de la serie de pasajeros por estación, sin sortear.
+
+Los pasajeros que llegan a la estación o en el step j son Poisson de media
+λ_o(j) y cada uno elige destino d con probabilidad p[o, d]. Llega a destino
+L[o, d] + 1 steps después, por lo que en el step k la estación s cuenta:
+
+    λ_s(k)  +  Σ_o λ_o(k - 1 - L[o, s]) · p[o, s]
+
+Todos los términos son Poisson independientes (por el reparto multinomial),
+así que la suma también es Poisson y su varianza es igual a la media.
+
+Sirve como oráculo para los modos agentes, cohortes y eventos (este último
+con la salida de un step; con intervalo_trenes las salidas dependen de los
+trenes y el resultado no aplica).
+"""
+import numpy as np
+
+
+def intensidades_por_step(modelo, steps):
+    """Tasa de llegada de cada estación (filas) en los steps 0..steps-1 (columnas)"""
+    columnas = np.arange(steps)
+    horizonte = modelo.intensidades.shape[1]
+    intensidades = modelo.intensidades[:, columnas % horizonte]
+    if not modelo.ciclico:
+        intensidades = np.where(columnas < horizonte, intensidades, 0.0)
+    return intensidades
+
+
+def serie_esperada(modelo, steps):
+    """Media y varianza de los pasajeros de cada estación en cada step, como
+    matrices steps × estaciones en el orden de modelo.nombres_estaciones"""
+    llegadas = intensidades_por_step(modelo, steps).T
+    media = llegadas.copy()
+
+    # Los que llegan a destino, agrupados por longitud de viaje
+    for longitud in np.unique(modelo.longitudes[modelo.longitudes > 0]):
+        retraso = int(longitud) + 1
+        if retraso >= steps:
+            continue
+        probabilidades = np.where(modelo.longitudes == longitud, modelo.matriz_od, 0.0)
+        media[retraso:] += llegadas[:-retraso] @ probabilidades
+
+    return media, media.copy()
+
+
+def data_esperada(modelo, steps):
+    """Media de la serie con la misma forma que modelo.data: un diccionario {estación: pasajeros} por step"""
+    media, _ = serie_esperada(modelo, steps)
+    return [dict(zip(modelo.nombres_estaciones, fila)) for fila in media.tolist()]
@@ -0,0 +1,180 @@
+"""Motor de eventos discretos con avance al próximo evento.
+
+El tiempo se mide en ticks enteros de `resolucion` minutos (como mucho un step
+del modelo; puede ser menor a un minuto, por ejemplo 0.5). En lugar de
+recorrer todos los ticks, cada estación tiene en una cola de prioridad el
+próximo tick en el que llega al menos un pasajero: se sortea invirtiendo la
+intensidad acumulada, así que los ticks sin llegadas (madrugada, noche) no
+cuestan nada. Cada llegada agenda los cambios que
+provoca en la cantidad de pasajeros de cada estación:
+
+- al llegar suma en la estación de partida
+- al salir (después de un step, o en el próximo tren si se indica intervalo_trenes) resta
+- al terminar el viaje (un step por estación recorrida) suma en el destino
+- un step después de llegar al destino resta
+
+Las fotos por step se toman en el último tick de cada step, con lo que se
+obtiene la misma regla de conteo que en los otros modos.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+import numpy as np
+
+from intensidad import matriz_intensidad, escalar_intensidad
+
+
+class MotorEventos:
+
+    def __init__(self, model, resolucion=None, intervalo_trenes=None, dias=1, multiplicador_demanda=1.0):
+        self.model = model
+        minutos_por_step = model.minutos_por_step
+        self.resolucion = resolucion or minutos_por_step
+        self.ticks_por_step = self._en_ticks(minutos_por_step)
+        if self.ticks_por_step is None:
+            raise ValueError("La resolución debe ser un divisor de los minutos por step.")
+        self.ticks_entre_trenes = None
+        if intervalo_trenes is not None:
+            self.ticks_entre_trenes = self._en_ticks(intervalo_trenes)
+            if not self.ticks_entre_trenes:
+                raise ValueError("El intervalo entre trenes debe ser múltiplo de la resolución.")
+
+        # Intensidad por tick y su acumulada (con un 0 inicial) para cada estación
+        intensidades = escalar_intensidad(
+            matriz_intensidad(model.nombres_estaciones, model.red.lineas, self.resolucion, model.minuto_inicial, dias,
+                              model.fecha_inicio),
+            multiplicador_demanda)
+        if model.mascara_origenes is not None:
+            intensidades = intensidades * model.mascara_origenes[:, None]
+        self.intensidades = intensidades
+        self.acumuladas = np.concatenate([np.zeros((len(intensidades), 1)), np.cumsum(intensidades, axis=1)], axis=1)
+        self.ticks_horizonte = intensidades.shape[1]
+
+        self.presentes = np.zeros(len(model.nombres_estaciones), dtype=np.int64)
+
+        # Próxima llegada de cada estación: (tick, estación)
+        self.llegadas = []
+        for estacion in range(len(self.presentes)):
+            self._agendar_llegada(estacion, 0)
+
+        # Cambios en los pasajeros presentes agrupados por tick, con una cola de los ticks pendientes
+        self.cambios = defaultdict(lambda: np.zeros(len(self.presentes), dtype=np.int64))
+        self.ticks_cambios = []
+
+        # Pasajeros activos y cuántos terminan el viaje en cada tick (se dan de baja al llegar a destino)
+        self.en_sistema = 0
+        self.finalizan = defaultdict(int)
+
+    def _en_ticks(self, minutos):
+        """Cantidad entera de ticks que hay en `minutos`, o None si no es múltiplo de la resolución"""
+        ticks = round(minutos / self.resolucion)
+        return int(ticks) if ticks > 0 and math.isclose(ticks * self.resolucion, minutos) else None
+
+    def _agendar_llegada(self, estacion, desde_tick):
+        """Sortea el primer tick desde desde_tick en el que llega algún pasajero a la estación"""
+        acumulada = self.acumuladas[estacion]
+        total_horizonte = acumulada[-1]
+        if total_horizonte <= 0:
+            return
+
+        ciclos, resto = divmod(desde_tick, self.ticks_horizonte)
+        objetivo = ciclos * total_horizonte + acumulada[resto] + self.model.rng.exponential()
+        ciclos, resto = divmod(objetivo, total_horizonte)
+        if ciclos > 0 and not self.model.ciclico:
+            return
+
+        tick = int(ciclos) * self.ticks_horizonte + int(np.searchsorted(acumulada, resto, side="right")) - 1
+        heapq.heappush(self.llegadas, (tick, estacion))
+
+    def _sortear_cantidad(self, tasa):
+        """Poisson condicionada a ser positiva (sabemos que en el tick llega al menos uno)"""
+        rng = self.model.rng
+        if tasa > 1:
+            while True:
+                cantidad = rng.poisson(tasa)
+                if cantidad > 0:
+                    return int(cantidad)
+
+        # Inversa de la distribución acumulada sobre (P(0), 1]
+        u = rng.uniform(math.exp(-tasa), 1.0)
+        cantidad, probabilidad = 0, math.exp(-tasa)
+        acumulada = probabilidad
+        while acumulada < u:
+            cantidad += 1
+            probabilidad *= tasa / cantidad
+            acumulada += probabilidad
+        return max(cantidad, 1)
+
+    def _agendar_cambio(self, tick, estacion, cantidad):
+        if tick not in self.cambios:
+            heapq.heappush(self.ticks_cambios, tick)
+        self.cambios[tick][estacion] += cantidad
+
+    def _procesar_llegada(self, tick, origen):
+        tasa = self.intensidades[origen, tick % self.ticks_horizonte]
+        cantidad = self._sortear_cantidad(tasa)
+        por_destino = self.model.rng.multinomial(cantidad, self.model.matriz_od[origen])
+        self.model.contador_pasajeros += cantidad
+        self.en_sistema += cantidad
+
+        if self.ticks_entre_trenes is None:
+            salida = tick + self.ticks_por_step
+        else:
+            salida = (tick // self.ticks_entre_trenes + 1) * self.ticks_entre_trenes
+
+        self._agendar_cambio(tick, origen, cantidad)
+        self._agendar_cambio(salida, origen, -cantidad)
+        for destino in np.flatnonzero(por_destino):
+            llegada = salida + int(self.model.longitudes[origen, destino]) * self.ticks_por_step
+            self._agendar_cambio(llegada, destino, por_destino[destino])
+            self.finalizan[llegada] += int(por_destino[destino])
+            self._agendar_cambio(llegada + self.ticks_por_step, destino, -por_destino[destino])
+
+    def _ultimo_tick_del_step(self):
+        return (self.model.schedule.steps + 1) * self.ticks_por_step - 1
+
+    def crear_pasajeros(self):
+        """Procesa las llegadas del step actual"""
+        limite = self._ultimo_tick_del_step()
+        while self.llegadas and self.llegadas[0][0] <= limite:
+            tick, estacion = heapq.heappop(self.llegadas)
+            self._procesar_llegada(tick, estacion)
+            self._agendar_llegada(estacion, tick + 1)
+
+    def avanzar(self):
+        """Aplica los cambios de los eventos ocurridos hasta el final del step actual"""
+        limite = self._ultimo_tick_del_step()
+        while self.ticks_cambios and self.ticks_cambios[0] <= limite:
+            tick = heapq.heappop(self.ticks_cambios)
+            self.presentes += self.cambios.pop(tick)
+            self.en_sistema -= self.finalizan.pop(tick, 0)
+
+    def obtener_estado(self):
+        """Copia de las colas de eventos y los pasajeros presentes, para checkpoints.
+        Las llegadas ya agendadas se conservan aunque el modelo restaurado cambie la demanda."""
+        return {
+            "presentes": self.presentes.copy(),
+            "llegadas": list(self.llegadas),
+            "cambios": {tick: cambio.copy() for tick, cambio in self.cambios.items()},
+            "ticks_cambios": list(self.ticks_cambios),
+            "en_sistema": self.en_sistema,
+            "finalizan": dict(self.finalizan),
+        }
+
+    def cargar_estado(self, estado):
+        self.presentes = estado["presentes"].copy()
+        self.llegadas = list(estado["llegadas"])
+        self.cambios.clear()
+        self.cambios.update((tick, cambio.copy()) for tick, cambio in estado["cambios"].items())
+        self.ticks_cambios = list(estado["ticks_cambios"])
+        self.en_sistema = estado["en_sistema"]
+        self.finalizan.clear()
+        self.finalizan.update(estado["finalizan"])
+
+    def contar_pasajeros(self):
+        return self.presentes.copy()
+
+    def cantidad_pasajeros(self):
+        """Cantidad total de pasajeros activos, sin contar los que ya llegaron a destino"""
+        return self.en_sistema
@@ -0,0 +1,202 @@
+"""Una sola corrida repartida entre procesos por estación de origen.
+
+Los pasajeros no interactúan entre sí: cada uno depende solo de las llegadas
+de su estación de origen y de su recorrido. Por eso una corrida se puede
+dividir en fragmentos que simulan solo los pasajeros de un grupo de
+estaciones de origen, cada uno con su propio flujo de números aleatorios, y
+la serie de la corrida es la suma de las series de los fragmentos.
+
+Los fragmentos viven en procesos que duran lo mismo que el modelo (ver
+EjecutorFragmentos): cada llamada solo envía la cantidad de steps y recibe
+las series, y los checkpoints (ver checkpoint.py) se generan únicamente al
+guardar el modelo. El resultado depende solo de la semilla y de la cantidad
+de fragmentos, no de la cantidad de procesos ni de cómo se partan los steps.
+"""
+import multiprocessing
+import os
+import weakref
+
+import numpy as np
+
+AVANZAR = "avanzar"
+CHECKPOINTS = "checkpoints"
+CERRAR = "cerrar"
+
+
+def repartir_origenes(demanda, fragmentos):
+    """Reparte las estaciones entre fragmentos equilibrando la demanda total de cada uno.
+    Devuelve una tupla de ids de estación por fragmento."""
+    grupos = [[] for _ in range(fragmentos)]
+    cargas = np.zeros(fragmentos)
+    # De mayor a menor demanda, cada estación va al fragmento menos cargado (empates por id)
+    for estacion in sorted(range(len(demanda)), key=lambda indice: (-demanda[indice], indice)):
+        destino = int(np.argmin(cargas))
+        grupos[destino].append(estacion)
+        cargas[destino] += demanda[estacion]
+    return [tuple(sorted(grupo)) for grupo in grupos]
+
+
+def crear_fragmentos(configuraciones, semillas, checkpoints, resiembras):
+    """Un modelo por fragmento, desde cero si su checkpoint es None. Al restaurar un
+    checkpoint se aplica la configuración actual (por ejemplo, otro multiplicador de
+    demanda) y, si su resiembra no es None, continúa con un generador nuevo."""
+    from Model import ModeloSubte
+    from checkpoint import restaurar_checkpoint
+
+    return [ModeloSubte(semilla=semilla, **configuracion) if checkpoint is None
+            else restaurar_checkpoint(checkpoint, resiembra, **configuracion)
+            for configuracion, semilla, checkpoint, resiembra in zip(configuraciones, semillas, checkpoints, resiembras)]
+
+
+def avanzar_fragmentos(modelos, steps):
+    """Avanza cada fragmento `steps` steps. Devuelve por fragmento la serie de esos
+    steps y los pasajeros creados."""
+    resultados = []
+    for modelo in modelos:
+        creados_antes = modelo.contador_pasajeros
+        for _ in range(steps):
+            modelo.step()
+        # El modelo principal junta las series; el fragmento no acumula historia
+        resultados.append((modelo.registro.vista().copy(), modelo.contador_pasajeros - creados_antes))
+        modelo.registro.vaciar()
+    return resultados
+
+
+def checkpoints_de(modelos):
+    from checkpoint import guardar_checkpoint
+
+    return [guardar_checkpoint(modelo, incluir_serie=False) for modelo in modelos]
+
+
+def _trabajador(conexion, configuraciones, semillas, checkpoints, resiembras):
+    """Atiende las órdenes del modelo principal para sus fragmentos hasta recibir CERRAR"""
+    try:
+        modelos = crear_fragmentos(configuraciones, semillas, checkpoints, resiembras)
+    except Exception as error:
+        modelos = error
+    while True:
+        orden, argumento = conexion.recv()
+        if orden == CERRAR:
+            break
+        try:
+            if isinstance(modelos, Exception):
+                raise modelos
+            if orden == AVANZAR:
+                respuesta = avanzar_fragmentos(modelos, argumento)
+            else:
+                respuesta = checkpoints_de(modelos)
+        except Exception as error:
+            # El error se vuelve a lanzar en el proceso principal
+            respuesta = error
+        conexion.send(respuesta)
+    conexion.close()
+
+
+def _detener(trabajadores, proceso_principal):
+    if os.getpid() != proceso_principal:
+        # Copia heredada por un proceso hijo: los trabajadores no son suyos
+        return
+    for conexion, proceso in trabajadores:
+        try:
+            conexion.send((CERRAR, None))
+        except (BrokenPipeError, OSError):
+            pass
+        proceso.join(timeout=1)
+        if proceso.is_alive():
+            proceso.terminate()
+        conexion.close()
+
+
+class EjecutorFragmentos:
+    """Fragmentos de un modelo, vivos entre llamadas.
+
+    Con un solo proceso los fragmentos son modelos del mismo proceso. Con más,
+    el fragmento i vive en el proceso i % procesos, que se crea una sola vez y
+    se detiene con cerrar() (o al descartar el ejecutor).
+    """
+
+    def __init__(self, configuraciones, semillas, checkpoints, resiembras, procesos):
+        self.cantidad = len(configuraciones)
+        self.procesos = max(1, min(procesos, self.cantidad))
+        self.modelos = None
+        self.trabajadores = []
+
+        if self.procesos == 1:
+            self.modelos = crear_fragmentos(configuraciones, semillas, checkpoints, resiembras)
+        else:
+            for trabajador in range(self.procesos):
+                indices = range(trabajador, self.cantidad, self.procesos)
+                conexion, conexion_hijo = multiprocessing.Pipe()
+                proceso = multiprocessing.Process(
+                    target=_trabajador, daemon=True,
+                    args=(conexion_hijo, [configuraciones[i] for i in indices], [semillas[i] for i in indices],
+                          [checkpoints[i] for i in indices], [resiembras[i] for i in indices]))
+                proceso.start()
+                conexion_hijo.close()
+                self.trabajadores.append((conexion, proceso))
+        self._finalizador = weakref.finalize(self, _detener, self.trabajadores, os.getpid())
+
+    def _pedir(self, orden, argumento=None):
+        """Envía la orden a todos los procesos y junta las respuestas en el orden de los fragmentos"""
+        for conexion, _ in self.trabajadores:
+            conexion.send((orden, argumento))
+        respuestas = [conexion.recv() for conexion, _ in self.trabajadores]
+        for respuesta in respuestas:
+            if isinstance(respuesta, Exception):
+                raise respuesta
+        resultados = [None] * self.cantidad
+        for trabajador, respuesta in enumerate(respuestas):
+            resultados[trabajador::self.procesos] = respuesta
+        return resultados
+
+    def avanzar(self, steps):
+        if self.modelos is not None:
+            return avanzar_fragmentos(self.modelos, steps)
+        return self._pedir(AVANZAR, steps)
+
+    def checkpoints(self):
+        if self.modelos is not None:
+            return checkpoints_de(self.modelos)
+        return self._pedir(CHECKPOINTS)
+
+    def cerrar(self):
+        self._finalizador()
+
+
+def _ejecutor(modelo):
+    """El ejecutor de los fragmentos del modelo, que se crea la primera vez"""
+    if modelo.ejecutor_fragmentos is None:
+        # Los fragmentos entregan la serie de cada llamada; la historia acotada la lleva el modelo
+        configuraciones = [{**modelo.configuracion, "fragmentos": 1, "procesos": None, "origenes": origenes,
+                            "capacidad_historia": None}
+                           for origenes in modelo.origenes_fragmentos]
+        resiembras = modelo.resiembras_fragmentos or [None] * modelo.fragmentos
+        modelo.ejecutor_fragmentos = EjecutorFragmentos(configuraciones, modelo.semillas_fragmentos,
+                                                        modelo.checkpoints_fragmentos, resiembras,
+                                                        modelo.procesos or os.cpu_count())
+        # Ya aplicadas: si el ejecutor se vuelve a crear, los fragmentos siguen desde sus checkpoints
+        modelo.resiembras_fragmentos = None
+    return modelo.ejecutor_fragmentos
+
+
+def ejecutar_fragmentos(modelo, steps):
+    """Ejecuta `steps` steps de todos los fragmentos del modelo y suma sus series en él"""
+    resultados = _ejecutor(modelo).avanzar(steps)
+
+    # Se suman en el orden de los fragmentos, así que la suma es siempre la misma
+    serie = sum(serie for serie, _ in resultados)
+    for fila in serie:
+        modelo.registro.registrar(fila)
+    modelo.contador_pasajeros += sum(creados for _, creados in resultados)
+    modelo.schedule.steps += steps
+    modelo.schedule.time += steps
+    if steps > 0:
+        modelo.conteos = serie[-1]
+        modelo.pasajeros_por_estacion = dict(zip(modelo.nombres_estaciones, modelo.conteos.tolist()))
+
+
+def checkpoints_fragmentos(modelo):
+    """Checkpoints actuales de los fragmentos del modelo"""
+    if modelo.ejecutor_fragmentos is None and modelo.resiembras_fragmentos is None:
+        return list(modelo.checkpoints_fragmentos)
+    return _ejecutor(modelo).checkpoints()
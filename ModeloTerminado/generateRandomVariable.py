@@ -1,42 +1,116 @@
+from functools import lru_cache
+
 from dataIngresos import ingresos_lineaA
 
 import numpy as np
-from scipy.stats import rv_discrete
+
+# Cantidad de intervalos del histograma de cada estación
+NUM_BINS = 20
 
 # Cache de distribuciones ya calculadas
 _distribuciones_cache = {}
 
+
+def histograma_ingresos(nombre_estacion, num_bins=NUM_BINS):
+    """Valores (centro de cada intervalo) y probabilidades del histograma de ingresos de la estación"""
+    if nombre_estacion not in ingresos_lineaA:
+        raise ValueError(f"No hay datos cargados para la estación: {nombre_estacion}")
+
+    datos = ingresos_lineaA[nombre_estacion]
+    hist, bin_edges = np.histogram(datos, bins=num_bins, density=True, range=(min(datos), max(datos)))
+    valores = 0.5 * (bin_edges[1:] + bin_edges[:-1])
+    return valores, hist / hist.sum()
+
+
 def generar_ingreso_pasajeros(nombre_estacion: str) -> int:
     """
     Devuelve un valor aleatorio de ingreso de pasajeros para la estación dada,
     según una distribución empírica construida a partir de datos reales.
-    """
 
-    if nombre_estacion not in ingresos_lineaA:
-        raise ValueError(f"No hay datos cargados para la estación: {nombre_estacion}")
+    Sortea de a un valor con scipy; para muchos valores usar muestrear_ingresos.
+    """
 
     # Si ya se construyó la distribución para esta estación, reutilizarla
     if nombre_estacion not in _distribuciones_cache:
-        datos = ingresos_lineaA[nombre_estacion]
-        
-        # Construcción de histograma
-        num_bins = 20
-        hist, bin_edges = np.histogram(datos, bins=num_bins, density=True, range=(min(datos), max(datos)))
-        valores = 0.5 * (bin_edges[1:] + bin_edges[:-1])
-        probabilidades = hist / hist.sum()
-
-        print("conteo: ", hist)
-        print("bordes: ", bin_edges)
-
-        # Crear distribución y guardar en cache
+        valores, probabilidades = histograma_ingresos(nombre_estacion)
+
+        # Crear distribución y guardar en cache (scipy se importa solo cuando hace falta)
+        from scipy.stats import rv_discrete
         distribucion = rv_discrete(name=nombre_estacion, values=(valores, probabilidades))
         _distribuciones_cache[nombre_estacion] = distribucion
 
     # Generar un valor aleatorio
     return int(_distribuciones_cache[nombre_estacion].rvs())
 
-# Generar 10 valores de variable aleatoria
-print("\n\n")
-for i in range(0,50):
-    aleatorio = generar_ingreso_pasajeros("Plaza de Mayo")
-    print("Variable Aleatoria: ", aleatorio)
\ No newline at end of file
+
+def construir_alias(probabilidades):
+    """Tablas del método de alias (Vose) para una distribución discreta.
+
+    Devuelve (aceptacion, alias): se elige un intervalo k uniforme y se lo
+    acepta con probabilidad aceptacion[k]; si no, el resultado es alias[k].
+    """
+    cantidad = len(probabilidades)
+    escaladas = np.asarray(probabilidades, dtype=np.float64) * cantidad
+    aceptacion = np.ones(cantidad)
+    alias = np.arange(cantidad)
+
+    chicas = [k for k in range(cantidad) if escaladas[k] < 1]
+    grandes = [k for k in range(cantidad) if escaladas[k] >= 1]
+    while chicas and grandes:
+        chica, grande = chicas.pop(), grandes.pop()
+        aceptacion[chica] = escaladas[chica]
+        alias[chica] = grande
+        escaladas[grande] -= 1 - escaladas[chica]
+        (chicas if escaladas[grande] < 1 else grandes).append(grande)
+
+    # Lo que queda tiene probabilidad 1 salvo por errores de redondeo
+    return aceptacion, alias
+
+
+@lru_cache(maxsize=None)
+def tablas_alias(num_bins=NUM_BINS):
+    """Tablas de alias de todas las estaciones de ingresos_lineaA, apiladas por fila.
+
+    Devuelve (estaciones, valores, aceptacion, alias), los tres últimos de
+    estaciones × num_bins y de solo lectura.
+    """
+    estaciones = tuple(ingresos_lineaA)
+    valores = np.empty((len(estaciones), num_bins))
+    aceptacion = np.empty((len(estaciones), num_bins))
+    alias = np.empty((len(estaciones), num_bins), dtype=np.int64)
+    for fila, nombre in enumerate(estaciones):
+        valores[fila], probabilidades = histograma_ingresos(nombre, num_bins)
+        aceptacion[fila], alias[fila] = construir_alias(probabilidades)
+
+    for tabla in (valores, aceptacion, alias):
+        tabla.flags.writeable = False
+    return estaciones, valores, aceptacion, alias
+
+
+def _muestrear(filas, n, rng, num_bins):
+    """Sortea n valores para cada fila de las tablas; devuelve filas × n"""
+    _, valores, aceptacion, alias = tablas_alias(num_bins)
+    filas = np.asarray(filas)[:, None]
+    intervalos = rng.integers(num_bins, size=(len(filas), n))
+    elegidos = np.where(rng.random((len(filas), n)) < aceptacion[filas, intervalos], intervalos, alias[filas, intervalos])
+    # Se trunca igual que int() en generar_ingreso_pasajeros
+    return valores[filas, elegidos].astype(np.int64)
+
+
+def muestrear_ingresos(nombre_estacion, n, rng, num_bins=NUM_BINS):
+    """n valores de ingreso de pasajeros de la estación, sorteados con el Generator rng"""
+    estaciones = tablas_alias(num_bins)[0]
+    if nombre_estacion not in estaciones:
+        raise ValueError(f"No hay datos cargados para la estación: {nombre_estacion}")
+    return _muestrear([estaciones.index(nombre_estacion)], n, rng, num_bins)[0]
+
+
+def muestrear_ingresos_estaciones(n, rng, num_bins=NUM_BINS):
+    """n valores para cada estación a la vez. Devuelve (estaciones, matriz estaciones × n)"""
+    estaciones = tablas_alias(num_bins)[0]
+    return estaciones, _muestrear(np.arange(len(estaciones)), n, rng, num_bins)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng()
+    print(muestrear_ingresos("Plaza de Mayo", 50, rng))
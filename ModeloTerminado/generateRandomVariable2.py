@@ -1,7 +1,4 @@
-from dataIngresos import ingresos_lineaA
-
 import numpy as np
-from scipy.interpolate import interp1d
 
 def create_intensity_function(data, original_step=15, new_step=5):
     # Asegúrate de que el nuevo step sea un divisor del original
@@ -25,20 +22,23 @@ def create_intensity_function(data, original_step=15, new_step=5):
     return intensity_function
 
 # Ejemplo de uso
-intensity_function = create_intensity_function(ingresos_lineaA["Plaza de Mayo"])
+if __name__ == "__main__":
+    from dataIngresos import ingresos_lineaA
+
+    intensity_function = create_intensity_function(ingresos_lineaA["Plaza de Mayo"])
 
-#print("ingresos flores ", ingresos_lineaA["Flores"]) 
+    #print("ingresos flores ", ingresos_lineaA["Flores"]) 
 
-print("\n")
+    print("\n")
 
-#print("funcion de intensidad de flores: ", intensity_function)
+    #print("funcion de intensidad de flores: ", intensity_function)
 
-print("funcion de intensidad de Plaza de Mayo: ", intensity_function[0:10])
+    print("funcion de intensidad de Plaza de Mayo: ", intensity_function[0:10])
 
-print("poisson de Plaza de Mayo: ", [np.random.poisson(rate) for rate in intensity_function[0:10]])
+    print("poisson de Plaza de Mayo: ", [np.random.poisson(rate) for rate in intensity_function[0:10]])
 
-"""
-for i in range(0, 1000):
-    rate = intensity_function(i)
-    print(np.random.poisson(rate))
-"""
+    """
+    for i in range(0, 1000):
+        rate = intensity_function(i)
+        print(np.random.poisson(rate))
+    """
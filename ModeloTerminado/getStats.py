@@ -1,16 +1,9 @@
-import pandas as pd
-import csv
+import numpy as np
 
-# Leer archivo CSV
-file_path = "202401_PAX15min-ABC.csv"
-
-try:
-    df = pd.read_csv(file_path, sep=';', encoding='utf-8', quoting=csv.QUOTE_NONE)
-
-except FileNotFoundError:
-    print(f"Error: El archivo {file_path} no se encontró.")
-    df = pd.DataFrame()
+from ingesta import RUTA_CSV, ingerir_csv, cargar_cache
 
+# Leer archivo CSV
+file_path = RUTA_CSV
 
 
 #Contar la cantidad de gente que se sube (POR estación, por hora)
@@ -32,44 +25,47 @@ class EstacionData:
         self.egresos = egresos   #Lista de cantidad de gente que sale de la estación cada 15 min
 
 
-#Cantidad de gente que ingresa a cada estacion cada 15 minutos
-df_agrupado = df.groupby(['DESDE', 'HASTA', 'LINEA', 'ESTACION'])['pax_pagos'].sum().reset_index()
-print(df_agrupado.head())  #muestra las primeras 5 filas del DataFrame resultante.
-
-#Obtener todas las distintas líneas y crear un objeto LineaData para cada una
-lineas_unicas = df['LINEA'].unique()
-lineas = [LineaData(nombre_linea) for nombre_linea in lineas_unicas]
+def obtener_lineas(ruta=file_path):
+    """Arma un LineaData por línea a partir del cache de la ingesta (procesa el CSV si hace falta)"""
+    indice, matriz = cargar_cache(ingerir_csv(ruta))
 
-#Por cada Linea, obtener todas las estaciones y crear un objeto EstacionData para cada una
-for linea in lineas:
-    estaciones_por_linea = df[df['LINEA'] == linea.nombre]['ESTACION'].unique()
-    for nombre_estacion in estaciones_por_linea:
+    lineas = []
+    inicio = 0
+    for nombre_linea, estaciones in indice["lineas"].items():
+        filas = matriz[inicio:inicio + len(estaciones)]
+        inicio += len(estaciones)
 
-        subidas = [valor for valor in df_agrupado[df_agrupado['ESTACION'] == nombre_estacion]['pax_pagos']]
-        
-        estacion = EstacionData(nombre_estacion, ingresos=subidas, egresos=[])
-        linea.agregar_estacion(estacion)
+        # Franjas de 15 min desde la primera hasta la última con ingresos en la línea
+        activas = np.flatnonzero(filas.any(axis=0))
+        desde, hasta = (activas[0], activas[-1] + 1) if len(activas) else (0, 0)
 
-print("Cantidad de mediciones en total: " + str(len(df['DESDE'].unique())))  # Imprimir la cantidad de mediciones de tiempo (cada 15 minutos)
-print("Ingresos en dorrego: " + str(lineas[0].estaciones["Dorrego"].ingresos))  # La cantidad de mediciones de ingresos por estación "Dorrego"
+        linea = LineaData(nombre_linea)
+        for nombre_estacion, subidas in zip(estaciones, filas[:, desde:hasta].tolist()):
+            linea.agregar_estacion(EstacionData(nombre_estacion, ingresos=subidas, egresos=[]))
+        lineas.append(linea)
 
-print("===================")
-print("0: " + str(lineas[0].nombre))
-print("1: " + str(lineas[1].nombre)) #Linea A
-print("2: " + str(lineas[2].nombre))
-print("===================")
+    return lineas
 
-#Diccionario que contienen clave (nombre de estación) valor (arreglo de cantidad de personas que entran en lapso de 15 min a las estacion)
-ingresos_lineaA = { estacion.nombre: estacion.ingresos for estacion in list(lineas[1].estaciones.values())}
 
-print("Ingresos Plaza de Mayo: ", ingresos_lineaA["Plaza de Mayo"])
-print("===================")
-print("Ingresos Perú: ", ingresos_lineaA["Plaza de Mayo"])
+if __name__ == "__main__":
+    try:
+        lineas = obtener_lineas()
+    except FileNotFoundError:
+        print(f"Error: El archivo {file_path} no se encontró.")
+        lineas = []
 
-print("\n=====================\n")
+    print("===================")
+    for i, linea in enumerate(lineas):
+        print(f"{i}: {linea.nombre}")
+    print("===================")
 
-#print("ingresos_lineaA = ", ingresos_lineaA)
+    #Diccionario que contienen clave (nombre de estación) valor (arreglo de cantidad de personas que entran en lapso de 15 min a las estacion)
+    linea_a = next((linea for linea in lineas if linea.nombre == "A"), None)
+    if linea_a is not None:
+        ingresos_lineaA = {estacion.nombre: estacion.ingresos for estacion in linea_a.estaciones.values()}
 
-#estaciones de la linea A
-print(list(ingresos_lineaA.keys()))
+        print("Ingresos Plaza de Mayo: ", ingresos_lineaA.get("Plaza de Mayo"))
+        print("\n=====================\n")
 
+        #estaciones de la linea A
+        print(list(ingresos_lineaA.keys()))
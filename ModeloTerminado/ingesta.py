@@ -0,0 +1,240 @@
+"""Ingesta de los datos de molinetes y cache binario de la demanda.
+
+El CSV se lee por partes con columnas tipadas y se acumulan los ingresos por
+(línea, estación, franja de 15 minutos). Al final se arma en un solo pivot la
+matriz estaciones × franjas de todas las líneas y se guarda como .npy (se puede
+abrir con memmap) junto a un índice JSON, ambos identificados por el hash del
+archivo de origen. Las corridas siguientes leen el cache sin volver a procesar
+el CSV.
+
+Con la columna FECHA también se acumulan los ingresos por tipo de día (hábil,
+sábado, domingo o feriado) en una matriz estaciones × tipos × franjas.
+"""
+import csv
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_CSV = os.path.join(DIRECTORIO, "202401_PAX15min-ABC.csv")
+DIRECTORIO_CACHE = os.path.join(DIRECTORIO, "cache")
+
+MINUTOS_POR_FRANJA = 15
+FRANJAS_POR_DIA = 24 * 60 // MINUTOS_POR_FRANJA
+TAMANO_CHUNK = 1_000_000
+
+# dataIngresos no guarda los horarios: se asume que su primera franja es la apertura del subte
+MINUTO_INICIAL_DATAINGRESOS = 5 * 60
+
+# Cambia cuando cambia el formato del cache; los caches de otra versión se regeneran
+VERSION_CACHE = 2
+
+TIPOS_DIA = ("habil", "sabado", "domingo_feriado")
+HABIL, SABADO, DOMINGO_FERIADO = range(len(TIPOS_DIA))
+
+# Feriados nacionales de fecha fija (mes, día); los trasladables se pasan aparte
+FERIADOS_FIJOS = frozenset({(1, 1), (3, 24), (4, 2), (5, 1), (5, 25), (6, 20), (7, 9), (12, 8), (12, 25)})
+
+
+def tipo_de_dia(fecha, feriados=()):
+    """HABIL, SABADO o DOMINGO_FERIADO para una fecha (datetime.date).
+    feriados: fechas adicionales a los feriados de fecha fija"""
+    if fecha.weekday() == 6 or (fecha.month, fecha.day) in FERIADOS_FIJOS or fecha in feriados:
+        return DOMINGO_FERIADO
+    return SABADO if fecha.weekday() == 5 else HABIL
+
+
+def hash_archivo(ruta, tamano_bloque=2**20):
+    """Hash SHA-256 del archivo leído por bloques"""
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(tamano_bloque), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def normalizar_linea(linea):
+    """'LineaA' -> 'A'"""
+    linea = str(linea).strip()
+    return linea[len("Linea"):].strip() if linea.lower().startswith("linea") else linea
+
+
+def _rutas_cache(clave, directorio_cache):
+    base = os.path.join(directorio_cache, f"demanda-{clave[:16]}")
+    return base + ".npy", base + ".json", base + "-tipos.npy"
+
+
+def _cache_vigente(clave, directorio_cache):
+    rutas = _rutas_cache(clave, directorio_cache)
+    if not all(os.path.exists(ruta) for ruta in rutas):
+        return False
+    with open(rutas[1], encoding="utf-8") as archivo:
+        return json.load(archivo).get("version") == VERSION_CACHE
+
+
+def _sello(ruta):
+    """Tamaño y fecha de modificación, para no recalcular el hash si el archivo no cambió"""
+    estado = os.stat(ruta)
+    return {"tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+
+def _buscar_por_sello(ruta, directorio_cache):
+    if not os.path.isdir(directorio_cache):
+        return None
+    sello = _sello(ruta)
+    for nombre in os.listdir(directorio_cache):
+        if not nombre.endswith(".json"):
+            continue
+        with open(os.path.join(directorio_cache, nombre), encoding="utf-8") as archivo:
+            indice = json.load(archivo)
+        if indice.get("origen") == {"archivo": os.path.basename(ruta), **sello} and _cache_vigente(indice["hash"], directorio_cache):
+            return indice["hash"]
+    return None
+
+
+def ingerir_csv(ruta=RUTA_CSV, directorio_cache=DIRECTORIO_CACHE, tamano_chunk=TAMANO_CHUNK):
+    """Procesa el CSV de molinetes por partes y guarda el cache. Devuelve el hash del archivo."""
+    import pandas as pd
+
+    clave = hash_archivo(ruta)
+    ruta_matriz, ruta_indice, ruta_tipos = _rutas_cache(clave, directorio_cache)
+    if _cache_vigente(clave, directorio_cache):
+        return clave
+
+    columnas = pd.read_csv(ruta, sep=";", encoding="utf-8", quoting=csv.QUOTE_NONE, nrows=0).columns
+    con_fecha = "FECHA" in columnas
+
+    acumulado, acumulado_tipos, fechas = None, None, set()
+    partes = pd.read_csv(
+        ruta, sep=";", encoding="utf-8", quoting=csv.QUOTE_NONE,
+        usecols=["DESDE", "LINEA", "ESTACION", "pax_pagos"] + (["FECHA"] if con_fecha else []),
+        dtype={"FECHA": "category", "DESDE": "category", "LINEA": "category", "ESTACION": "category", "pax_pagos": "int32"},
+        chunksize=tamano_chunk,
+    )
+    for parte in partes:
+        # Las franjas se calculan sobre las categorías (pocos valores distintos), no fila por fila
+        minutos = pd.to_timedelta(parte["DESDE"].cat.categories.astype(str)).total_seconds() // 60
+        franjas = (minutos // MINUTOS_POR_FRANJA).astype("int16")
+        parte = parte.assign(FRANJA=np.asarray(franjas)[parte["DESDE"].cat.codes])
+
+        suma = parte.groupby(["LINEA", "ESTACION", "FRANJA"], observed=True)["pax_pagos"].sum()
+        acumulado = suma if acumulado is None else acumulado.add(suma, fill_value=0)
+
+        if con_fecha:
+            # Igual que las franjas, el tipo de día se calcula una vez por fecha distinta
+            dias = pd.to_datetime(parte["FECHA"].cat.categories.astype(str), dayfirst=True, format="mixed").date
+            fechas.update(dias)
+            tipos = np.array([tipo_de_dia(dia) for dia in dias], dtype=np.int8)
+            parte = parte.assign(TIPO=tipos[parte["FECHA"].cat.codes])
+            suma = parte.groupby(["LINEA", "ESTACION", "TIPO", "FRANJA"], observed=True)["pax_pagos"].sum()
+            acumulado_tipos = suma if acumulado_tipos is None else acumulado_tipos.add(suma, fill_value=0)
+
+    # Un único pivot para todas las líneas: filas (línea, estación), columnas franja del día
+    matriz = (acumulado.unstack("FRANJA", fill_value=0)
+              .reindex(columns=range(FRANJAS_POR_DIA), fill_value=0)
+              .sort_index())
+
+    lineas = {}
+    for linea, estacion in matriz.index:
+        lineas.setdefault(normalizar_linea(linea), []).append(str(estacion))
+
+    # Perfil de cada tipo de día: el promedio de sus días, en la misma escala que la matriz
+    # general (suma de todos los días). Sin FECHA o sin días de un tipo se usa el general.
+    dias_por_tipo = [sum(tipo_de_dia(fecha) == tipo for fecha in fechas) for tipo in range(len(TIPOS_DIA))]
+    general = matriz.to_numpy(dtype=np.float64)
+    por_tipo = np.repeat(general[:, None, :], len(TIPOS_DIA), axis=1)
+    for tipo, cantidad in enumerate(dias_por_tipo):
+        if cantidad == 0:
+            continue
+        suma_tipo = (acumulado_tipos.xs(tipo, level="TIPO").unstack("FRANJA", fill_value=0)
+                     .reindex(index=matriz.index, columns=range(FRANJAS_POR_DIA), fill_value=0))
+        por_tipo[:, tipo] = suma_tipo.to_numpy(dtype=np.float64) * len(fechas) / cantidad
+
+    os.makedirs(directorio_cache, exist_ok=True)
+    np.save(ruta_matriz, matriz.to_numpy(dtype=np.int64))
+    np.save(ruta_tipos, por_tipo)
+    indice = {
+        "hash": clave,
+        "version": VERSION_CACHE,
+        "origen": {"archivo": os.path.basename(ruta), **_sello(ruta)},
+        "minutos_por_franja": MINUTOS_POR_FRANJA,
+        "lineas": lineas,
+        "tipos_dia": list(TIPOS_DIA),
+        "dias_por_tipo": dias_por_tipo,
+    }
+    with open(ruta_indice, "w", encoding="utf-8") as archivo:
+        json.dump(indice, archivo, ensure_ascii=False, indent=2)
+
+    return clave
+
+
+def origen_demanda(ruta_csv=RUTA_CSV, directorio_cache=DIRECTORIO_CACHE):
+    """Identifica los datos de ingresos con los que corre el modelo: el hash del CSV o,
+    si no está, el de dataIngresos.py"""
+    if not os.path.exists(ruta_csv):
+        return "dataIngresos-" + hash_archivo(os.path.join(DIRECTORIO, "dataIngresos.py"))
+    return _buscar_por_sello(ruta_csv, directorio_cache) or hash_archivo(ruta_csv)
+
+
+def cargar_cache(clave, directorio_cache=DIRECTORIO_CACHE, por_tipo_dia=False):
+    """Abre el cache como memmap de solo lectura. Devuelve (índice, matriz); con por_tipo_dia
+    la matriz es estaciones × tipos de día × franjas."""
+    ruta_matriz, ruta_indice, ruta_tipos = _rutas_cache(clave, directorio_cache)
+    with open(ruta_indice, encoding="utf-8") as archivo:
+        indice = json.load(archivo)
+    return indice, np.load(ruta_tipos if por_tipo_dia else ruta_matriz, mmap_mode="r")
+
+
+@lru_cache(maxsize=None)
+def cargar_demanda(linea="A", ruta_csv=RUTA_CSV, directorio_cache=DIRECTORIO_CACHE, tipo_dia=None):
+    """Perfil diario de ingresos de la línea y minuto del día en que empiezan los datos.
+
+    Devuelve ({estación: arreglo de FRANJAS_POR_DIA franjas desde las 00:00}, minuto_inicial).
+    Usa el cache del CSV (procesándolo la primera vez). Si el CSV no está
+    disponible, se usan los datos de dataIngresos.
+
+    tipo_dia: HABIL, SABADO o DOMINGO_FERIADO para el perfil de ese tipo de día;
+        None (o sin CSV) usa el perfil de todos los días
+    """
+    if not os.path.exists(ruta_csv):
+        from dataIngresos import ingresos_lineaA
+        if linea != "A":
+            raise ValueError(f"No hay datos cargados para la línea {linea}: falta el archivo {ruta_csv}")
+        perfiles = {nombre: ubicar_en_dia(valores, MINUTO_INICIAL_DATAINGRESOS) for nombre, valores in ingresos_lineaA.items()}
+        return perfiles, MINUTO_INICIAL_DATAINGRESOS
+
+    clave = _buscar_por_sello(ruta_csv, directorio_cache) or ingerir_csv(ruta_csv, directorio_cache)
+    indice, matriz = cargar_cache(clave, directorio_cache)
+
+    inicio = 0
+    for nombre_linea, estaciones in indice["lineas"].items():
+        if nombre_linea == linea:
+            filas = matriz[inicio:inicio + len(estaciones)]
+            # Los datos empiezan en la primera franja con ingresos, igual que en dataIngresos
+            primera = int(np.flatnonzero(filas.any(axis=0))[0]) if filas.any() else 0
+            if tipo_dia is not None:
+                filas = cargar_cache(clave, directorio_cache, por_tipo_dia=True)[1][inicio:inicio + len(estaciones), tipo_dia]
+            return {nombre: filas[i] for i, nombre in enumerate(estaciones)}, primera * MINUTOS_POR_FRANJA
+        inicio += len(estaciones)
+
+    raise ValueError(f"No hay datos cargados para la línea {linea}")
+
+
+def ubicar_en_dia(valores, minuto_inicial):
+    """Ubica una serie de franjas de 15 min que empieza en minuto_inicial dentro de un día
+    completo; lo que pasa de la medianoche vuelve al comienzo del día"""
+    perfil = np.zeros(FRANJAS_POR_DIA, dtype=np.int64)
+    franjas = (minuto_inicial // MINUTOS_POR_FRANJA + np.arange(len(valores))) % FRANJAS_POR_DIA
+    np.add.at(perfil, franjas, valores)
+    return perfil
+
+
+if __name__ == "__main__":
+    clave = ingerir_csv()
+    indice, matriz = cargar_cache(clave)
+    print(f"Cache {clave[:16]}: {matriz.shape[0]} estaciones × {matriz.shape[1]} franjas")
+    for nombre_linea, estaciones in indice["lineas"].items():
+        print(f"Línea {nombre_linea}: {', '.join(estaciones)}")
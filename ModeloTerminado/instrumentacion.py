@@ -0,0 +1,147 @@
+"""Instrumentación opcional de ModeloSubte.
+
+Si el modelo se crea con instrumentacion=Instrumentacion(...), cada step se
+ejecuta fase por fase (ver ModeloSubte.fases) midiendo:
+- el tiempo de cada fase
+- los pasajeros creados, eliminados y activos
+- las llamadas a los generadores aleatorios, por método
+
+Las métricas de cada step se agregan como una línea JSON a ruta_jsonl y los
+acumulados se escriben en formato de texto de Prometheus en ruta_prometheus
+(para el textfile collector de node exporter). Sin instrumentación, step()
+solo paga la comprobación de un atributo.
+"""
+import json
+import os
+import time
+from collections import Counter
+
+
+class GeneradorContado:
+    """Envuelve un generador aleatorio y cuenta las llamadas a cada método"""
+
+    def __init__(self, generador, llamadas):
+        self._generador = generador
+        self._llamadas = llamadas
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._generador, nombre)
+        if not callable(atributo):
+            return atributo
+
+        def contado(*args, **kwargs):
+            self._llamadas[nombre] += 1
+            return atributo(*args, **kwargs)
+        return contado
+
+
+class Instrumentacion:
+    """Métricas por step de un modelo.
+
+    ruta_jsonl: archivo al que se agrega una línea JSON por step
+    ruta_prometheus: archivo de métricas de Prometheus, reescrito cada `cada` steps
+    """
+
+    def __init__(self, ruta_jsonl=None, ruta_prometheus=None, cada=1):
+        self.ruta_prometheus = ruta_prometheus
+        self.cada = cada
+        self.archivo_jsonl = open(ruta_jsonl, "a", encoding="utf-8") if ruta_jsonl is not None else None
+        self.modelo = None
+
+        self.llamadas_rng = Counter()
+        self.steps = 0
+        self.tiempo_fases = Counter()
+        self.creados = 0
+        self.eliminados = 0
+        self.activos = 0
+        self.ultimo = None
+
+    def instalar(self, modelo):
+        """Engancha la instrumentación al modelo y envuelve sus generadores aleatorios"""
+        self.modelo = modelo
+        modelo.instrumentacion = self
+        modelo.rng = GeneradorContado(modelo.rng, self.llamadas_rng)
+        # mesa usa model.random para el orden de activación de los agentes
+        modelo.random = GeneradorContado(modelo.random, self.llamadas_rng)
+        self.activos = modelo.cantidad_pasajeros()
+
+    def medir_step(self, modelo):
+        """Ejecuta un step de `modelo` midiendo cada fase"""
+        creados_antes = modelo.contador_pasajeros
+        activos_antes = self.activos
+        llamadas_antes = Counter(self.llamadas_rng)
+
+        tiempos = {}
+        inicio = time.perf_counter()
+        for nombre, fase in modelo.fases():
+            inicio_fase = time.perf_counter()
+            fase()
+            tiempos[nombre] = time.perf_counter() - inicio_fase
+        tiempo_step = time.perf_counter() - inicio
+
+        creados = modelo.contador_pasajeros - creados_antes
+        self.activos = modelo.cantidad_pasajeros()
+        eliminados = activos_antes + creados - self.activos
+
+        self.steps += 1
+        self.tiempo_fases.update(tiempos)
+        self.creados += creados
+        self.eliminados += eliminados
+        self.ultimo = {
+            "step": modelo.schedule.steps,
+            "segundos_step": tiempo_step,
+            "segundos_fases": tiempos,
+            "creados": creados,
+            "eliminados": eliminados,
+            "activos": self.activos,
+            "llamadas_rng": dict(self.llamadas_rng - llamadas_antes),
+        }
+
+        if self.archivo_jsonl is not None:
+            self.archivo_jsonl.write(json.dumps(self.ultimo) + "\n")
+        if self.ruta_prometheus is not None and self.steps % self.cada == 0:
+            self.escribir_prometheus()
+
+    def texto_prometheus(self):
+        """Métricas acumuladas en formato de texto de Prometheus"""
+        lineas = [
+            "# HELP subte_steps_total Steps simulados.",
+            "# TYPE subte_steps_total counter",
+            f"subte_steps_total {self.steps}",
+            "# HELP subte_fase_segundos_total Tiempo acumulado de cada fase del step.",
+            "# TYPE subte_fase_segundos_total counter",
+            *(f'subte_fase_segundos_total{{fase="{fase}"}} {segundos:.9f}' for fase, segundos in self.tiempo_fases.items()),
+            "# HELP subte_pasajeros_creados_total Pasajeros creados.",
+            "# TYPE subte_pasajeros_creados_total counter",
+            f"subte_pasajeros_creados_total {self.creados}",
+            "# HELP subte_pasajeros_eliminados_total Pasajeros que terminaron su viaje.",
+            "# TYPE subte_pasajeros_eliminados_total counter",
+            f"subte_pasajeros_eliminados_total {self.eliminados}",
+            "# HELP subte_pasajeros_activos Pasajeros activos al final del último step.",
+            "# TYPE subte_pasajeros_activos gauge",
+            f"subte_pasajeros_activos {self.activos}",
+            "# HELP subte_llamadas_rng_total Llamadas a los generadores aleatorios por método.",
+            "# TYPE subte_llamadas_rng_total counter",
+            *(f'subte_llamadas_rng_total{{metodo="{metodo}"}} {cantidad}' for metodo, cantidad in sorted(self.llamadas_rng.items())),
+        ]
+        if self.ultimo is not None:
+            lineas += [
+                "# HELP subte_step_segundos Duración del último step.",
+                "# TYPE subte_step_segundos gauge",
+                f"subte_step_segundos {self.ultimo['segundos_step']:.9f}",
+            ]
+        return "\n".join(lineas) + "\n"
+
+    def escribir_prometheus(self):
+        # Se escribe a un temporal y se reemplaza para que el collector nunca lea un archivo a medias
+        temporal = f"{self.ruta_prometheus}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(self.texto_prometheus())
+        os.replace(temporal, self.ruta_prometheus)
+
+    def cerrar(self):
+        if self.ruta_prometheus is not None:
+            self.escribir_prometheus()
+        if self.archivo_jsonl is not None:
+            self.archivo_jsonl.close()
+            self.archivo_jsonl = None
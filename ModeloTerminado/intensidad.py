@@ -0,0 +1,175 @@
+"""Matriz de intensidad (tasa de llegada esperada) estaciones × steps.
+
+Se calcula una sola vez por proceso para cada configuración y se comparte
+entre todas las instancias del modelo en modo solo lectura. Los procesos
+creados con fork la heredan sin copiarla. El multiplicador de demanda no es
+parte de la configuración: cada modelo escala la matriz compartida (ver
+escalar_intensidad), así un barrido de multiplicadores no guarda una matriz
+por valor.
+"""
+import datetime
+import math
+import re
+import unicodedata
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+from ingesta import cargar_demanda, tipo_de_dia, MINUTOS_POR_FRANJA, FRANJAS_POR_DIA
+from red import LINEAS
+
+MINUTOS_POR_DIA = 24 * 60
+
+# Configuraciones distintas (líneas, resolución, días, ...) cuya matriz queda en memoria
+MATRICES_EN_CACHE = 8
+
+
+def parsear_hora(hora):
+    """'08:30' -> 510 minutos desde la medianoche"""
+    horas, minutos = hora.split(":")
+    return int(horas) * 60 + int(minutos)
+
+
+def demanda_lineas(lineas, tipo_dia=None):
+    """(línea, perfiles, minuto inicial) de cada línea con datos de ingresos (ver
+    ingesta.cargar_demanda). Las líneas sin datos se omiten con un aviso."""
+    for linea in lineas:
+        try:
+            perfiles_linea, minuto = cargar_demanda(linea, tipo_dia=tipo_dia)
+        except ValueError as error:
+            warnings.warn(f"{error}. Sus estaciones no generan pasajeros (solo pueden ser destino).")
+            continue
+        yield linea, perfiles_linea, minuto
+
+
+def perfiles_red(lineas=("A",), tipo_dia=None):
+    """Perfiles diarios de ingresos de las estaciones de todas las líneas con datos y
+    el minuto del día en que empiezan (el más temprano entre las líneas).
+
+    Las líneas sin datos se omiten (con un aviso): sus estaciones no generan pasajeros
+    pero pueden ser destino. tipo_dia elige el perfil de un tipo de día (ver ingesta.TIPOS_DIA).
+    """
+    perfiles, minutos = {}, []
+    for _, perfiles_linea, minuto in demanda_lineas(lineas, tipo_dia):
+        perfiles.update(perfiles_linea)
+        minutos.append(minuto)
+    return perfiles, min(minutos, default=0)
+
+
+def normalizar_nombre(nombre):
+    """'Ángel  Gallardo' -> 'angel gallardo': sin tildes, mayúsculas ni signos"""
+    sin_tildes = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", sin_tildes.casefold()).split())
+
+
+def perfiles_estaciones(estaciones, lineas=("A",), tipo_dia=None):
+    """Perfiles diarios de ingresos de `estaciones` (filas, en ese orden) × franjas.
+
+    Los nombres se comparan con normalizar_nombre y, si no aparecen así, por la
+    parte anterior a " - " ("Los Incas - Parque Chas" -> "Los Incas"). Las
+    estaciones de líneas sin datos quedan en cero; tanto en ese caso como si una
+    línea tiene datos pero alguna de sus estaciones no aparece, se avisa.
+    """
+    perfiles = np.zeros((len(estaciones), FRANJAS_POR_DIA))
+    for linea, perfiles_linea, _ in demanda_lineas(lineas, tipo_dia):
+        por_nombre = {normalizar_nombre(nombre): perfil for nombre, perfil in perfiles_linea.items()}
+        faltantes = []
+        for fila, nombre in enumerate(estaciones):
+            if nombre not in LINEAS[linea]:
+                continue
+            perfil = por_nombre.get(normalizar_nombre(nombre))
+            if perfil is None:
+                perfil = por_nombre.get(normalizar_nombre(nombre.split(" - ")[0]))
+            if perfil is None:
+                faltantes.append(nombre)
+            else:
+                perfiles[fila] = perfil
+        if faltantes:
+            warnings.warn(f"Estaciones de la línea {linea} sin datos de ingresos (no generan pasajeros): "
+                          f"{', '.join(faltantes)}", stacklevel=2)
+    return perfiles
+
+
+def minuto_inicial_datos(lineas=("A",)):
+    """Minuto del día en que empiezan los datos de ingresos de las líneas"""
+    return perfiles_red(lineas)[1]
+
+
+def intensidad_por_step(perfiles, minutos_por_step, minuto_inicial, dias=1):
+    """Convierte perfiles de franjas de 15 min en tasas por step.
+
+    Se asume que los ingresos se reparten de forma uniforme dentro de cada
+    franja. Los perfiles pueden cubrir un día o varios días seguidos. El
+    resultado cubre `dias` días desde minuto_inicial; pasado el final de los
+    perfiles se vuelve a empezar.
+    """
+    steps = math.ceil(dias * MINUTOS_POR_DIA / minutos_por_step)
+
+    if MINUTOS_POR_FRANJA % minutos_por_step == 0 and minuto_inicial % minutos_por_step == 0:
+        # Cada franja se divide en partes iguales, como en create_intensity_function
+        factor = int(MINUTOS_POR_FRANJA // minutos_por_step)
+        por_step = np.repeat(perfiles / factor, factor, axis=1)
+        columnas = (int(minuto_inicial // minutos_por_step) + np.arange(steps)) % por_step.shape[1]
+        return por_step[:, columnas]
+
+    # Caso general: diferencias de los ingresos acumulados en los bordes de cada step
+    bordes_franjas = np.arange(perfiles.shape[1] + 1) * MINUTOS_POR_FRANJA
+    acumulados = np.concatenate([np.zeros((perfiles.shape[0], 1)), np.cumsum(perfiles, axis=1)], axis=1)
+
+    instantes = minuto_inicial + minutos_por_step * np.arange(steps + 1)
+    dias_completos, minuto_del_dia = np.divmod(instantes, bordes_franjas[-1])
+    acumulado_en_instantes = np.array([
+        dias_completos * fila[-1] + np.interp(minuto_del_dia, bordes_franjas, fila)
+        for fila in acumulados
+    ])
+    return np.diff(acumulado_en_instantes, axis=1)
+
+
+def perfiles_calendario(estaciones, lineas, fecha_inicio, dias):
+    """Perfiles de `dias` días seguidos desde fecha_inicio ("2024-01-01"), cada día con
+    el perfil de su tipo (hábil, sábado, domingo o feriado). Estaciones × franjas."""
+    inicio = datetime.date.fromisoformat(str(fecha_inicio))
+    por_tipo = {}
+    dias_perfiles = []
+    for dia in range(dias):
+        tipo = tipo_de_dia(inicio + datetime.timedelta(days=dia))
+        if tipo not in por_tipo:
+            por_tipo[tipo] = perfiles_estaciones(estaciones, lineas, tipo)
+        dias_perfiles.append(por_tipo[tipo])
+    return np.concatenate(dias_perfiles, axis=1)
+
+
+@lru_cache(maxsize=MATRICES_EN_CACHE)
+def matriz_intensidad(estaciones, lineas=("A",), minutos_por_step=5, minuto_inicial=None, dias=1, fecha_inicio=None):
+    """Matriz de solo lectura con la tasa de llegada de cada estación (filas, en el
+    orden de `estaciones`) en cada step (columnas) desde minuto_inicial.
+
+    estaciones: tupla de nombres de estación
+    lineas: tupla de líneas de las que se toman los ingresos
+    minuto_inicial: minuto del día del primer step; None usa el comienzo de los datos
+    dias: cantidad de días que cubre la matriz
+    fecha_inicio: fecha del primer día ("2024-01-01"); cada día usa el perfil de su tipo.
+        None usa el mismo perfil (de todos los días) para todos
+    """
+    if minuto_inicial is None:
+        minuto_inicial = minuto_inicial_datos(lineas)
+
+    if fecha_inicio is None:
+        perfiles = perfiles_estaciones(estaciones, lineas)
+    else:
+        # Días de calendario que toca la corrida, incluido el último si el horizonte pasa la medianoche
+        dias_calendario = math.ceil((minuto_inicial + dias * MINUTOS_POR_DIA) / MINUTOS_POR_DIA)
+        perfiles = perfiles_calendario(estaciones, lineas, fecha_inicio, dias_calendario)
+    matriz = intensidad_por_step(perfiles, minutos_por_step, minuto_inicial, dias)
+    matriz.flags.writeable = False
+    return matriz
+
+
+def escalar_intensidad(matriz, multiplicador):
+    """La matriz compartida con la demanda multiplicada; sin cambio (1.0) no se copia"""
+    if multiplicador == 1:
+        return matriz
+    escalada = matriz * multiplicador
+    escalada.flags.writeable = False
+    return escalada
@@ -1,22 +1,18 @@
-import datetime
 import streamlit as st
-import mesa
-import random
-import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from enum import Enum
-from typing import List, Dict
 import time
+import queue
+import threading
 from Model import ModeloSubte
+from esperado import serie_esperada
 
-def plot_data(data, estaciones):
-    # Generate the list of datetime objects
-    datetime_objects = [datetime.datetime(2024, 1, 1, 0) + datetime.timedelta(minutes=5 * i + 60 * 8) for i in range(len(data))]
+# Segundos entre actualizaciones del gráfico en el modo rápido
+INTERVALO_REFRESCO = 0.5
 
-    # Create a DataFrame with the datetime objects and the data
-    df = pd.DataFrame(data, index=datetime_objects)
+def plot_data(df, estaciones):
+    # df: una columna por estación, indexado por la hora de cada step (RegistroSeries.como_dataframe)
 
     # Create two columns for the plots
     col1, col2 = st.columns(2)
@@ -56,16 +52,97 @@ def plot_data(data, estaciones):
 
     st.pyplot(fig_combined)
 
+@st.cache_resource
+def corridas_guardadas():
+    """Corridas completas por (steps, parámetros del modelo), compartidas entre sesiones"""
+    return {}
+
+def simular_en_segundo_plano(modelo, steps, cola):
+    """Ejecuta la simulación fuera del hilo de la interfaz y publica cada step en la cola"""
+    for _ in range(steps):
+        modelo.step()
+        cola.put(modelo.conteos.copy())
+    cola.put(None)
+
+def ejecutar_modo_rapido(steps, parametros):
+    """Simula en un hilo aparte y va agregando filas a un único gráfico, actualizado
+    como mucho cada INTERVALO_REFRESCO segundos. Las corridas terminadas quedan guardadas."""
+    clave = (steps, tuple(sorted(parametros.items())))
+    corridas = corridas_guardadas()
+    if clave in corridas:
+        st.line_chart(corridas[clave])
+        st.success("Escenario recuperado de una corrida anterior")
+        return
+
+    modelo = ModeloSubte(**parametros)
+    estaciones = list(modelo.nombres_estaciones)
+    inicio = pd.Timestamp(2024, 1, 1) + pd.Timedelta(minutes=modelo.minuto_inicial)
+    paso = pd.Timedelta(minutes=modelo.minutos_por_step)
+
+    cola = queue.Queue()
+    hilo = threading.Thread(target=simular_en_segundo_plano, args=(modelo, steps, cola), daemon=True)
+    progress_bar = st.progress(0)
+    grafico = st.line_chart(pd.DataFrame(columns=estaciones, index=pd.DatetimeIndex([]), dtype="int64"))
+    hilo.start()
+
+    recibidos = 0
+    terminado = False
+    while not terminado:
+        time.sleep(INTERVALO_REFRESCO)
+        filas = []
+        while True:
+            try:
+                fila = cola.get_nowait()
+            except queue.Empty:
+                break
+            if fila is None:
+                terminado = True
+                break
+            filas.append(fila)
+
+        if filas:
+            horas = pd.date_range(inicio + paso * recibidos, periods=len(filas), freq=paso)
+            grafico.add_rows(pd.DataFrame(filas, index=horas, columns=estaciones))
+            recibidos += len(filas)
+            progress_bar.progress(recibidos / steps)
+
+    hilo.join()
+    corridas[clave] = modelo.registro.como_dataframe(modelo.minuto_inicial, modelo.minutos_por_step)
+    st.success("Simulación completada")
+
+def mostrar_valor_esperado(steps):
+    """Gráfico instantáneo de la media exacta de cada estación, sin simular"""
+    modelo = ModeloSubte()
+    media, _ = serie_esperada(modelo, steps)
+    horas = pd.date_range(pd.Timestamp(2024, 1, 1) + pd.Timedelta(minutes=modelo.minuto_inicial),
+                          periods=steps, freq=pd.Timedelta(minutes=modelo.minutos_por_step))
+    st.line_chart(pd.DataFrame(media, index=horas, columns=list(modelo.nombres_estaciones)))
+    st.success("Valor esperado calculado")
+
 def main():
     st.title("Simulación de la Línea A del Subte")
-    modelo = ModeloSubte()
 
     steps_input = st.text_input("Ingrese cantidad de steps a simular (cada step representa 5 min de la realidad):")
 
+    modo_rapido = st.checkbox("Modo rápido (simulación en segundo plano y un solo gráfico)")
+    if modo_rapido:
+        semilla = st.number_input("Semilla", min_value=0, value=0, step=1)
+        motor = st.selectbox("Motor", ["cohortes", "agentes", "eventos", "valor esperado"])
+
     if st.button("Iniciar Simulación"):
-        progress_bar = st.progress(0)
         steps = int(steps_input)
 
+        if modo_rapido and motor == "valor esperado":
+            mostrar_valor_esperado(steps)
+            return
+
+        if modo_rapido:
+            ejecutar_modo_rapido(steps, {"modo": motor, "semilla": int(semilla)})
+            return
+
+        modelo = ModeloSubte()
+        progress_bar = st.progress(0)
+
         for i in range(steps):
             modelo.step()
             estado = modelo.obtener_estado_tiempo_real()
@@ -83,7 +160,7 @@ def main():
 
         # Mostrar gráficos por estación en dos columnas y un gráfico conjunto al final
         st.write("### Evolución de Pasajeros por Estación")
-        plot_data(modelo.data, modelo.estaciones)
+        plot_data(modelo.registro.como_dataframe(modelo.minuto_inicial, modelo.minutos_por_step), modelo.estaciones)
 
 if __name__ == "__main__":
     main()
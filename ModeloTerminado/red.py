@@ -0,0 +1,81 @@
+"""Red de subte formada por varias líneas y sus combinaciones.
+
+Cada estación recibe un id entero (las de la primera línea conservan su índice
+de auxiliarData). Las longitudes de viaje entre todos los pares de estaciones
+se calculan una sola vez en una matriz densa de enteros, por lo que obtener la
+longitud de un pasajero cuesta O(1) sin importar el recorrido.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from auxiliarData import lineas_aux_data, nombres_lineas, transbordos
+
+LINEAS = dict(zip(nombres_lineas, lineas_aux_data))
+
+# Cantidad de steps que lleva hacer una combinación entre líneas
+COSTO_TRANSBORDO = 1
+
+# Longitud entre estaciones que no están conectadas
+SIN_CONEXION = -1
+
+
+class RedSubte:
+    """Grafo de estaciones de las líneas indicadas.
+
+    estaciones: {nombre: id}
+    nombres: nombres ordenados por id
+    linea_de_estacion: línea de cada estación, por id
+    longitudes[o, d]: steps de viaje entre o y d (SIN_CONEXION si no hay camino)
+    """
+
+    def __init__(self, lineas=("A",), costo_transbordo=COSTO_TRANSBORDO):
+        self.lineas = tuple(lineas)
+        self.estaciones = {}
+        self.linea_de_estacion = []
+        tramos = []
+
+        for linea in self.lineas:
+            if linea not in LINEAS:
+                raise ValueError(f"Línea desconocida: {linea}")
+            ids = []
+            for nombre in sorted(LINEAS[linea], key=LINEAS[linea].get):
+                if nombre not in self.estaciones:
+                    self.estaciones[nombre] = len(self.estaciones)
+                    self.linea_de_estacion.append(linea)
+                ids.append(self.estaciones[nombre])
+            # Estaciones consecutivas de la línea están a un step de distancia
+            tramos.extend((a, b, 1) for a, b in zip(ids, ids[1:]))
+
+        for origen, destino in transbordos:
+            if origen in self.estaciones and destino in self.estaciones:
+                tramos.append((self.estaciones[origen], self.estaciones[destino], costo_transbordo))
+
+        self.nombres = tuple(self.estaciones)
+        self.longitudes = self._calcular_longitudes(len(self.nombres), tramos)
+        self.longitudes.flags.writeable = False
+
+    @staticmethod
+    def _calcular_longitudes(n, tramos):
+        """Camino mínimo entre todos los pares (Floyd-Warshall vectorizado)"""
+        infinito = np.iinfo(np.int64).max // 4
+        distancias = np.full((n, n), infinito, dtype=np.int64)
+        np.fill_diagonal(distancias, 0)
+        for a, b, costo in tramos:
+            distancias[a, b] = distancias[b, a] = min(distancias[a, b], costo)
+
+        for k in range(n):
+            np.minimum(distancias, distancias[:, k:k + 1] + distancias[k:k + 1, :], out=distancias)
+
+        distancias[distancias >= infinito] = SIN_CONEXION
+        return distancias
+
+    def conectadas(self):
+        """Matriz booleana de pares (origen, destino) distintos entre los que se puede viajar"""
+        return self.longitudes > 0
+
+
+@lru_cache(maxsize=None)
+def red_subte(lineas=("A",), costo_transbordo=COSTO_TRANSBORDO):
+    """Red compartida (de solo lectura) para una combinación de líneas"""
+    return RedSubte(lineas, costo_transbordo)
@@ -0,0 +1,218 @@
+"""Registro columnar de la serie de pasajeros por estación.
+
+Guarda una fila por step en un arreglo NumPy steps × estaciones que se
+preasigna y crece por bloques. Opcionalmente, cada vez que se completa un
+bloque se vuelca a disco como .npz y se libera la memoria, de modo que las
+corridas largas no acumulan historia en memoria.
+
+RegistroAcotado es la alternativa de memoria constante para horizontes largos
+(un mes o más): guarda los últimos steps en un buffer circular y resúmenes
+por hora y por día (media y máximo de cada estación), también circulares.
+"""
+import os
+
+import numpy as np
+
+FILAS_POR_BLOQUE = 288  # un día de steps de 5 minutos
+HORAS_RESUMEN = 24 * 31
+DIAS_RESUMEN = 366
+
+
+class RegistroSeries:
+    """Serie steps × estaciones de pasajeros.
+
+    directorio_volcado: si se indica, los bloques completos se guardan en ese
+        directorio como bloque-NNNNNN.npz y se descartan de memoria
+    """
+
+    def __init__(self, estaciones, filas_por_bloque=FILAS_POR_BLOQUE, directorio_volcado=None, dtype=np.int64):
+        self.estaciones = list(estaciones)
+        self.filas_por_bloque = filas_por_bloque
+        self.directorio_volcado = directorio_volcado
+        self.datos = np.zeros((filas_por_bloque, len(self.estaciones)), dtype=dtype)
+        self.filas = 0            # filas ocupadas en memoria
+        self.filas_volcadas = 0   # filas ya guardadas en disco
+        self.bloques_volcados = []
+
+        if directorio_volcado is not None:
+            os.makedirs(directorio_volcado, exist_ok=True)
+
+    def __len__(self):
+        return self.filas_volcadas + self.filas
+
+    def registrar(self, conteos):
+        """Agrega la fila de un step"""
+        if self.filas == len(self.datos):
+            if self.directorio_volcado is not None:
+                self.volcar()
+            else:
+                # Crece de a un bloque; la copia se amortiza entre todos los steps del bloque
+                self.datos = np.concatenate([self.datos, np.zeros_like(self.datos[:self.filas_por_bloque])])
+        self.datos[self.filas] = conteos
+        self.filas += 1
+
+    def volcar(self):
+        """Guarda en disco las filas en memoria y las descarta"""
+        if self.directorio_volcado is None or self.filas == 0:
+            return
+        ruta = os.path.join(self.directorio_volcado, f"bloque-{len(self.bloques_volcados):06d}.npz")
+        np.savez(ruta, pasajeros=self.datos[:self.filas], primer_step=self.filas_volcadas + 1,
+                 estaciones=np.array(self.estaciones))
+        self.bloques_volcados.append(ruta)
+        self.filas_volcadas += self.filas
+        self.filas = 0
+
+    def vaciar(self):
+        """Descarta las filas en memoria sin guardarlas"""
+        self.filas = 0
+
+    def vista(self):
+        """Vista sin copia (solo lectura) de las filas que están en memoria"""
+        vista = self.datos[:self.filas]
+        vista.flags.writeable = False
+        return vista
+
+    def serie_completa(self):
+        """Toda la serie, incluidos los bloques volcados a disco"""
+        if not self.bloques_volcados:
+            return self.vista()
+        bloques = [np.load(ruta)["pasajeros"] for ruta in self.bloques_volcados]
+        return np.concatenate(bloques + [self.vista()])
+
+    def como_dataframe(self, minuto_inicial=None, minutos_por_step=5):
+        """DataFrame con una columna por estación. El índice es el número de step o,
+        si se indica minuto_inicial, la hora de cada step."""
+        import pandas as pd
+
+        steps = np.arange(1, len(self) + 1)
+        if minuto_inicial is None:
+            indice = pd.Index(steps, name="Step")
+        else:
+            indice = pd.Timestamp(2024, 1, 1) + pd.to_timedelta(minuto_inicial + minutos_por_step * (steps - 1), unit="min")
+        return pd.DataFrame(self.serie_completa(), index=indice, columns=self.estaciones)
+
+
+class ResumenPeriodico:
+    """Media y máximo de cada estación por período (hora, día, ...) del reloj.
+
+    Guarda los últimos `capacidad` períodos cerrados en arreglos circulares;
+    inicios son los minutos (desde la medianoche del primer día) en que empieza cada uno.
+    """
+
+    def __init__(self, estaciones, minutos_periodo, capacidad):
+        self.minutos_periodo = minutos_periodo
+        self.capacidad = capacidad
+        self.inicios = np.zeros(capacidad, dtype=np.int64)
+        self.medias = np.zeros((capacidad, estaciones))
+        self.maximos = np.zeros((capacidad, estaciones), dtype=np.int64)
+        self.cerrados = 0
+
+        # Período en curso
+        self.periodo = None
+        self.suma = np.zeros(estaciones)
+        self.maximo = np.zeros(estaciones, dtype=np.int64)
+        self.filas = 0
+
+    def agregar(self, minuto, conteos):
+        periodo = minuto // self.minutos_periodo
+        if periodo != self.periodo:
+            if self.filas:
+                self._cerrar()
+            self.periodo = periodo
+        self.suma += conteos
+        np.maximum(self.maximo, conteos, out=self.maximo)
+        self.filas += 1
+
+    def _cerrar(self):
+        posicion = self.cerrados % self.capacidad
+        self.inicios[posicion] = self.periodo * self.minutos_periodo
+        self.medias[posicion] = self.suma / self.filas
+        self.maximos[posicion] = self.maximo
+        self.cerrados += 1
+        self.suma[:] = 0
+        self.maximo[:] = 0
+        self.filas = 0
+
+    def tabla(self):
+        """Períodos guardados en orden, incluido el que está en curso (que puede estar incompleto).
+        Devuelve {"inicio": minutos, "media": períodos × estaciones, "maximo": períodos × estaciones}"""
+        guardados = min(self.cerrados, self.capacidad)
+        orden = (self.cerrados - guardados + np.arange(guardados)) % self.capacidad
+        inicio, media, maximo = self.inicios[orden], self.medias[orden], self.maximos[orden]
+        if self.filas:
+            inicio = np.append(inicio, self.periodo * self.minutos_periodo)
+            media = np.vstack([media, self.suma / self.filas])
+            maximo = np.vstack([maximo, self.maximo])
+        return {"inicio": inicio, "media": media, "maximo": maximo}
+
+
+class RegistroAcotado:
+    """Serie steps × estaciones con memoria constante sin importar el horizonte.
+
+    Guarda los últimos `capacidad` steps en un buffer circular y resúmenes por
+    hora y por día (ver ResumenPeriodico). Tiene la misma interfaz que
+    RegistroSeries, pero serie_completa devuelve solo los steps retenidos.
+    """
+
+    def __init__(self, estaciones, capacidad=FILAS_POR_BLOQUE, minuto_inicial=0, minutos_por_step=5,
+                 horas_resumen=HORAS_RESUMEN, dias_resumen=DIAS_RESUMEN, dtype=np.int64):
+        self.estaciones = list(estaciones)
+        self.capacidad = capacidad
+        self.minuto_inicial = minuto_inicial
+        self.minutos_por_step = minutos_por_step
+        self.datos = np.zeros((capacidad, len(self.estaciones)), dtype=dtype)
+        self.total = 0
+        self.por_hora = ResumenPeriodico(len(self.estaciones), 60, horas_resumen)
+        self.por_dia = ResumenPeriodico(len(self.estaciones), 24 * 60, dias_resumen)
+
+    def __len__(self):
+        return self.total
+
+    def registrar(self, conteos):
+        """Agrega la fila de un step, pisando la más vieja si el buffer está lleno"""
+        self.datos[self.total % self.capacidad] = conteos
+        minuto = self.minuto_inicial + self.total * self.minutos_por_step
+        self.por_hora.agregar(minuto, conteos)
+        self.por_dia.agregar(minuto, conteos)
+        self.total += 1
+
+    def primer_step(self):
+        """Número del step más viejo retenido"""
+        return max(1, self.total - self.capacidad + 1)
+
+    def vista(self):
+        """Copia (solo lectura) de los steps retenidos en orden"""
+        retenidas = min(self.total, self.capacidad)
+        vista = self.datos[(self.primer_step() - 1 + np.arange(retenidas)) % self.capacidad]
+        vista.flags.writeable = False
+        return vista
+
+    def serie_completa(self):
+        return self.vista()
+
+    def como_dataframe(self, minuto_inicial=None, minutos_por_step=5):
+        """DataFrame de los steps retenidos, indexado como en RegistroSeries.como_dataframe"""
+        import pandas as pd
+
+        steps = np.arange(self.primer_step(), self.total + 1)
+        if minuto_inicial is None:
+            indice = pd.Index(steps, name="Step")
+        else:
+            indice = pd.Timestamp(2024, 1, 1) + pd.to_timedelta(minuto_inicial + minutos_por_step * (steps - 1), unit="min")
+        return pd.DataFrame(self.serie_completa(), index=indice, columns=self.estaciones)
+
+    def resumen_horario(self):
+        return self.por_hora.tabla()
+
+    def resumen_diario(self):
+        return self.por_dia.tabla()
+
+
+def leer_volcado(directorio):
+    """Lee todos los bloques volcados en un directorio. Devuelve (estaciones, serie)."""
+    rutas = sorted(os.path.join(directorio, nombre) for nombre in os.listdir(directorio)
+                   if nombre.startswith("bloque-") and nombre.endswith(".npz"))
+    if not rutas:
+        return [], np.zeros((0, 0), dtype=np.int64)
+    bloques = [np.load(ruta) for ruta in rutas]
+    return list(bloques[0]["estaciones"]), np.concatenate([bloque["pasajeros"] for bloque in bloques])
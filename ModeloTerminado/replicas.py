@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Model import ModeloSubte, MODO_COHORTES
+from red import red_subte
+
+
+def ejecutar_replica(semilla, steps, modo=MODO_COHORTES, lineas=("A",)):
+    """Ejecuta una réplica y devuelve la matriz steps × estaciones de pasajeros"""
+    modelo = ModeloSubte(modo=modo, semilla=semilla, lineas=lineas)
+    for _ in range(steps):
+        modelo.step()
+    return np.array(modelo.registro.serie_completa())
+
+
+def ejecutar_replicas(n_replicas, semilla_base, steps, modo=MODO_COHORTES, procesos=None, confianza=0.95, lineas=("A",)):
+    """Ejecuta n_replicas independientes en paralelo y resume los resultados.
+
+    Cada réplica usa su propio flujo de números aleatorios derivado de semilla_base
+    con SeedSequence, por lo que los resultados son los mismos sin importar la
+    cantidad de procesos.
+
+    Devuelve un diccionario con las estaciones y, por step y estación, la media,
+    la varianza y los límites del intervalo de confianza.
+    """
+    if n_replicas < 2:
+        raise ValueError("Se necesitan al menos 2 réplicas para estimar la varianza.")
+
+    semillas = np.random.SeedSequence(semilla_base).spawn(n_replicas)
+    procesos = procesos or os.cpu_count()
+
+    if procesos == 1:
+        resultados = [ejecutar_replica(semilla, steps, modo, lineas) for semilla in semillas]
+    else:
+        with ProcessPoolExecutor(max_workers=min(procesos, n_replicas)) as pool:
+            # map conserva el orden de las réplicas
+            resultados = list(pool.map(ejecutar_replica, semillas, [steps] * n_replicas, [modo] * n_replicas,
+                                       [lineas] * n_replicas))
+
+    return resumir_replicas(np.stack(resultados), list(red_subte(tuple(lineas)).nombres), confianza)
+
+
+def resumir_replicas(resultados, estaciones, confianza=0.95):
+    """Calcula media, varianza e intervalo de confianza (t de Student) sobre el eje de réplicas"""
+    from scipy.stats import t
+
+    n_replicas = resultados.shape[0]
+    media = resultados.mean(axis=0)
+    varianza = resultados.var(axis=0, ddof=1)
+    margen = t.ppf((1 + confianza) / 2, n_replicas - 1) * np.sqrt(varianza / n_replicas)
+
+    return {
+        "estaciones": estaciones,
+        "media": media,
+        "varianza": varianza,
+        "ic_inferior": media - margen,
+        "ic_superior": media + margen,
+    }
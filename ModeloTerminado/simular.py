@@ -0,0 +1,116 @@
+"""Ejecución de la simulación sin interfaz gráfica.
+
+Uso:
+    python -m simular --steps 200 --salida resultados.csv [--modo cohortes] [--semilla 42]
+
+El tiempo de arranque (importar el modelo y construirlo) se mide en cada
+ejecución y se compara con un presupuesto: si se excede, el comando termina
+con código de salida 2 para que se detecte en los procesos automáticos.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+
+_INICIO = time.perf_counter()
+
+# Presupuesto de arranque en segundos (importaciones + construcción del modelo). Medido: entre
+# 0.8 s (archivos en caché del sistema) y 1.8 s (en frío), casi todo importando mesa; se deja
+# el doble del peor caso para que solo falle ante una regresión real
+PRESUPUESTO_ARRANQUE = 4.0
+
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(prog="simular", description="Simulación del Subte sin interfaz")
+    parser.add_argument("--steps", type=int, required=True, help="cantidad de steps a simular")
+    parser.add_argument("--salida", required=True, help="archivo de resultados (.csv o .json)")
+    parser.add_argument("--modo", default="agentes", choices=["agentes", "cohortes", "eventos"])
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--minutos-por-step", type=int, default=5)
+    parser.add_argument("--hora-inicio", default=None, help="hora del primer step, por ejemplo 08:00")
+    parser.add_argument("--fecha-inicio", default=None,
+                        help="fecha del primer día (2024-01-01); cada día usa el perfil de su tipo")
+    parser.add_argument("--dias", type=int, default=1, help="días que cubre la intensidad")
+    parser.add_argument("--capacidad-historia", type=int, default=None,
+                        help="guarda solo los últimos steps (y resúmenes por hora y día) con memoria constante")
+    parser.add_argument("--lineas", nargs="+", default=["A"], help="líneas de la red a simular, por ejemplo A B C")
+    parser.add_argument("--resolucion", type=float, default=None,
+                        help="en modo eventos, minutos de cada instante de llegada (divisor de --minutos-por-step)")
+    parser.add_argument("--intervalo-trenes", type=int, default=None,
+                        help="en modo eventos, minutos entre trenes")
+    parser.add_argument("--fragmentos", type=int, default=1,
+                        help="reparte la corrida por estación de origen entre procesos")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos para los fragmentos")
+    parser.add_argument("--metricas-jsonl", default=None, help="archivo al que se agregan métricas por step (JSON lines)")
+    parser.add_argument("--metricas-prometheus", default=None,
+                        help="archivo de métricas en formato de texto de Prometheus")
+    parser.add_argument("--presupuesto-arranque", type=float, default=PRESUPUESTO_ARRANQUE,
+                        help="segundos máximos permitidos para el arranque")
+    return parser.parse_args(argv)
+
+
+def escribir_resultados(ruta, estaciones, filas, metricas, primer_step=1):
+    """Escribe una fila por step; en JSON se agregan también las métricas de la corrida"""
+    if ruta.endswith(".json"):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"metricas": metricas, "estaciones": estaciones, "primer_step": primer_step, "pasajeros": filas},
+                      archivo, ensure_ascii=False)
+        return
+
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["Step", *estaciones])
+        for step, fila in enumerate(filas, start=primer_step):
+            escritor.writerow([step, *fila])
+
+
+def main(argv=None):
+    args = parsear_argumentos(argv)
+
+    # El modelo se importa recién acá para que --help no pague el costo de mesa. Model no puede
+    # evitarlo: ModeloSubte hereda de mesa.Model y usa RandomActivation, y cualquier submódulo de
+    # mesa ejecuta su __init__, que importa pandas, networkx y la visualización
+    from Model import ModeloSubte
+
+    instrumentacion = None
+    if args.metricas_jsonl or args.metricas_prometheus:
+        from instrumentacion import Instrumentacion
+        instrumentacion = Instrumentacion(args.metricas_jsonl, args.metricas_prometheus)
+
+    modelo = ModeloSubte(modo=args.modo, semilla=args.semilla,
+                         minutos_por_step=args.minutos_por_step, hora_inicio=args.hora_inicio,
+                         lineas=tuple(args.lineas), resolucion=args.resolucion,
+                         intervalo_trenes=args.intervalo_trenes, instrumentacion=instrumentacion,
+                         fragmentos=args.fragmentos, procesos=args.procesos, dias=args.dias,
+                         fecha_inicio=args.fecha_inicio, capacidad_historia=args.capacidad_historia)
+    tiempo_arranque = time.perf_counter() - _INICIO
+
+    inicio_simulacion = time.perf_counter()
+    modelo.ejecutar(args.steps)
+    tiempo_simulacion = time.perf_counter() - inicio_simulacion
+    if instrumentacion is not None:
+        instrumentacion.cerrar()
+    estaciones = list(modelo.registro.estaciones)
+    filas = modelo.registro.serie_completa().tolist()
+
+    metricas = {
+        "tiempo_arranque_s": round(tiempo_arranque, 4),
+        "presupuesto_arranque_s": args.presupuesto_arranque,
+        "tiempo_simulacion_s": round(tiempo_simulacion, 4),
+        "steps": args.steps,
+        "modo": args.modo,
+        "semilla": args.semilla,
+        "lineas": args.lineas,
+    }
+    escribir_resultados(args.salida, estaciones, filas, metricas, len(modelo.registro) - len(filas) + 1)
+    print(json.dumps(metricas), file=sys.stderr)
+
+    if tiempo_arranque > args.presupuesto_arranque:
+        print(f"Arranque de {tiempo_arranque:.3f}s excede el presupuesto de {args.presupuesto_arranque}s", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
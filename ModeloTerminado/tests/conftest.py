@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del modelo se importan como en el resto del proyecto: from Model import ...
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import pytest
+
+import barrido
+from barrido import AlmacenResultados, clave_escenario, ejecutar_barrido
+
+GRILLA = {"modo": ["cohortes"], "multiplicador_demanda": [1, 2]}
+STEPS = 5
+
+
+def test_clave_normaliza_numeros_e_incluye_los_datos():
+    clave = clave_escenario({"multiplicador_demanda": 1, "lineas": ("A",)}, 1, STEPS, "datos")
+    assert clave == clave_escenario({"multiplicador_demanda": 1.0, "lineas": ["A"]}, 1, STEPS, "datos")
+    assert clave != clave_escenario({"multiplicador_demanda": 1, "lineas": ("A",)}, 1, STEPS, "otros datos")
+
+
+def test_omite_lo_ya_calculado_y_retoma_lo_que_falta(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "barrido.sqlite")
+
+    # La segunda corrida se interrumpe: el primer escenario queda guardado
+    original = barrido.ejecutar_escenario
+    llamadas = []
+
+    def interrumpido(configuracion, semilla, steps):
+        llamadas.append(semilla)
+        if len(llamadas) == 2:
+            raise KeyboardInterrupt
+        return original(configuracion, semilla, steps)
+
+    monkeypatch.setattr(barrido, "ejecutar_escenario", interrumpido)
+    with pytest.raises(KeyboardInterrupt):
+        ejecutar_barrido(GRILLA, [1, 2], STEPS, ruta, procesos=1)
+    monkeypatch.setattr(barrido, "ejecutar_escenario", original)
+
+    assert ejecutar_barrido(GRILLA, [1, 2], STEPS, ruta, procesos=1) == {"total": 4, "existentes": 1, "ejecutados": 3}
+    assert ejecutar_barrido(GRILLA, [1, 2], STEPS, ruta, procesos=1) == {"total": 4, "existentes": 4, "ejecutados": 0}
+
+    # Los mismos valores escritos como float no se repiten; un valor nuevo solo ejecuta lo suyo
+    ampliada = {"modo": ["cohortes"], "multiplicador_demanda": [1.0, 2.0, 3.0]}
+    assert ejecutar_barrido(ampliada, [1, 2], STEPS, ruta, procesos=1) == {"total": 6, "existentes": 4, "ejecutados": 2}
+
+    almacen = AlmacenResultados(ruta)
+    try:
+        resultados = almacen.resultados()
+    finally:
+        almacen.cerrar()
+    assert len(resultados) == 6
+    assert all(resultado["serie"].shape[0] == STEPS for resultado in resultados)
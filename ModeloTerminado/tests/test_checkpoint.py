@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from Model import ModeloSubte, MODO_AGENTES, MODO_COHORTES, MODO_EVENTOS
+from checkpoint import guardar_checkpoint, restaurar_checkpoint
+
+
+@pytest.mark.parametrize("modo", [MODO_AGENTES, MODO_COHORTES, MODO_EVENTOS])
+def test_checkpoint_continua_igual(modo):
+    original = ModeloSubte(modo=modo, semilla=3)
+    original.ejecutar(15)
+    restaurado = restaurar_checkpoint(guardar_checkpoint(original))
+    original.ejecutar(15)
+    restaurado.ejecutar(15)
+    np.testing.assert_array_equal(restaurado.registro.serie_completa(), original.registro.serie_completa())
+    assert restaurado.contador_pasajeros == original.contador_pasajeros
+
+
+def test_no_se_cambian_parametros_estructurales():
+    checkpoint = guardar_checkpoint(ModeloSubte(modo=MODO_COHORTES, semilla=1))
+    with pytest.raises(ValueError, match="modo"):
+        restaurar_checkpoint(checkpoint, modo=MODO_AGENTES)
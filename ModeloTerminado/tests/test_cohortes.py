@@ -0,0 +1,13 @@
+import numpy as np
+
+from Model import ModeloSubte, MODO_AGENTES, MODO_COHORTES
+
+
+def test_agentes_y_cohortes_iguales_con_la_misma_semilla():
+    agentes = ModeloSubte(modo=MODO_AGENTES, semilla=7)
+    cohortes = ModeloSubte(modo=MODO_COHORTES, semilla=7)
+    agentes.ejecutar(30)
+    cohortes.ejecutar(30)
+    assert agentes.contador_pasajeros > 0
+    np.testing.assert_array_equal(agentes.registro.serie_completa(), cohortes.registro.serie_completa())
+    assert agentes.contador_pasajeros == cohortes.contador_pasajeros
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from Model import ModeloSubte, MODO_COHORTES, MODO_EVENTOS
+from esperado import serie_esperada
+
+STEPS = 30
+
+
+# Agentes da la misma serie que cohortes (ver test_cohortes.py) y es mucho más lento
+@pytest.mark.parametrize("modo", [MODO_COHORTES, MODO_EVENTOS])
+def test_media_coincide_con_el_valor_esperado(modo):
+    # El total de cada estación en el horizonte es Poisson (cada pasajero la cuenta a lo sumo
+    # una vez), así que su desvío es la raíz de la media
+    semillas = range(20)
+    observado = 0
+    for semilla in semillas:
+        modelo = ModeloSubte(modo=modo, semilla=semilla)
+        modelo.ejecutar(STEPS)
+        observado = observado + modelo.registro.serie_completa().sum(axis=0)
+    media, varianza = serie_esperada(ModeloSubte(modo=modo), STEPS)
+    np.testing.assert_array_equal(media, varianza)
+    esperado = media.sum(axis=0) * len(semillas)
+    z = (observado - esperado) / np.sqrt(esperado)
+    assert np.abs(z).max() < 5
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from Model import ModeloSubte, MODO_AGENTES, MODO_COHORTES, MODO_EVENTOS
+from checkpoint import bifurcar, guardar_checkpoint, restaurar_checkpoint
+
+
+def continuacion(modelo, steps=20):
+    """Serie de los próximos `steps` steps del modelo"""
+    antes = len(modelo.registro)
+    modelo.ejecutar(steps)
+    return np.array(modelo.registro.serie_completa()[antes:])
+
+
+@pytest.mark.parametrize("modo", [MODO_AGENTES, MODO_COHORTES, MODO_EVENTOS])
+def test_fragmentos_no_dependen_de_los_procesos_ni_del_reparto_de_steps(modo):
+    de_a_uno = ModeloSubte(modo=modo, semilla=5, fragmentos=3, procesos=1)
+    for _ in range(20):
+        de_a_uno.step()
+    en_bloques = ModeloSubte(modo=modo, semilla=5, fragmentos=3, procesos=2)
+    en_bloques.ejecutar(7)
+    en_bloques.ejecutar(13)
+    en_bloques.cerrar()
+    np.testing.assert_array_equal(de_a_uno.registro.serie_completa(), en_bloques.registro.serie_completa())
+    assert de_a_uno.contador_pasajeros == en_bloques.contador_pasajeros
+
+
+def test_ramas_de_un_checkpoint_con_fragmentos():
+    original = ModeloSubte(modo=MODO_COHORTES, semilla=1, fragmentos=2, procesos=1)
+    original.ejecutar(40)
+    checkpoint = guardar_checkpoint(original)
+
+    semilla_1, semilla_2, sin_semilla, otra_vez_1 = [continuacion(rama) for rama in bifurcar(checkpoint, [1, 2, None, 1])]
+    sigue = continuacion(original)
+    assert not np.array_equal(semilla_1, semilla_2)
+    assert not np.array_equal(semilla_1, sigue)
+    np.testing.assert_array_equal(semilla_1, otra_vez_1)
+    np.testing.assert_array_equal(sin_semilla, sigue)
+
+    # Los cambios de parámetros también llegan a los fragmentos
+    mas_demanda = continuacion(restaurar_checkpoint(checkpoint, multiplicador_demanda=5.0))
+    assert mas_demanda.sum() > 3 * sigue.sum()
+
+
+def test_semilla_nueva_se_conserva_al_guardar_antes_de_avanzar():
+    original = ModeloSubte(modo=MODO_COHORTES, semilla=1, fragmentos=2, procesos=1)
+    original.ejecutar(40)
+    rama = restaurar_checkpoint(guardar_checkpoint(original), semilla=3)
+    copia = restaurar_checkpoint(guardar_checkpoint(rama))
+    np.testing.assert_array_equal(continuacion(rama), continuacion(copia))
@@ -0,0 +1,35 @@
+import numpy as np
+
+from generateRandomVariable import construir_alias, histograma_ingresos, muestrear_ingresos
+
+
+def probabilidades_de_alias(aceptacion, alias):
+    """Probabilidad de cada resultado que implican las tablas de alias"""
+    cantidad = len(aceptacion)
+    probabilidades = aceptacion / cantidad
+    np.add.at(probabilidades, alias, (1 - aceptacion) / cantidad)
+    return probabilidades
+
+
+def test_tablas_de_alias_reproducen_la_distribucion():
+    rng = np.random.default_rng(0)
+    probabilidades = rng.random(37)
+    probabilidades[[3, 20]] = 0
+    probabilidades /= probabilidades.sum()
+    np.testing.assert_allclose(probabilidades_de_alias(*construir_alias(probabilidades)), probabilidades, atol=1e-12)
+
+
+def test_muestreo_sigue_el_histograma_de_la_estacion():
+    n = 200_000
+    valores, probabilidades = histograma_ingresos("Plaza de Mayo")
+    muestras = muestrear_ingresos("Plaza de Mayo", n, np.random.default_rng(1))
+
+    # Los valores se truncan a entero como en generar_ingreso_pasajeros
+    esperados = {}
+    for valor, probabilidad in zip(valores.astype(np.int64).tolist(), probabilidades):
+        esperados[valor] = esperados.get(valor, 0) + probabilidad
+    observados = dict(zip(*np.unique(muestras, return_counts=True)))
+    assert set(observados) <= set(esperados)
+    for valor, probabilidad in esperados.items():
+        desvio = np.sqrt(n * probabilidad * (1 - probabilidad)) or 1
+        assert abs(observados.get(valor, 0) - n * probabilidad) / desvio < 5
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from ingesta import cargar_cache, cargar_demanda, hash_archivo, ingerir_csv, MINUTOS_POR_FRANJA
+
+FILAS = [
+    # FECHA, DESDE, LINEA, ESTACION, pax_pagos
+    ("01/01/2024", "07:00:00", "LineaA", "Peru", 10),
+    ("01/01/2024", "07:00:00", "LineaA", "Peru", 5),
+    ("01/01/2024", "07:15:00", "LineaA", "Lima", 7),
+    ("02/01/2024", "08:30:00", "LineaB", "Callao", 3),
+]
+
+
+def escribir_csv(ruta):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("FECHA;DESDE;HASTA;LINEA;MOLINETE;ESTACION;pax_pagos\n")
+        for fecha, desde, linea, estacion, pax in FILAS:
+            archivo.write(f"{fecha};{desde};{desde};{linea};M0;{estacion};{pax}\n")
+
+
+def franja(hora, minuto):
+    return (hora * 60 + minuto) // MINUTOS_POR_FRANJA
+
+
+def test_ingesta_y_cache_ida_y_vuelta(tmp_path):
+    ruta = str(tmp_path / "molinetes.csv")
+    directorio_cache = str(tmp_path / "cache")
+    escribir_csv(ruta)
+
+    clave = ingerir_csv(ruta, directorio_cache, tamano_chunk=2)
+    assert clave == hash_archivo(ruta)
+    indice, matriz = cargar_cache(clave, directorio_cache)
+    assert indice["lineas"] == {"A": ["Lima", "Peru"], "B": ["Callao"]}
+
+    assert matriz[1, franja(7, 0)] == 15 and matriz[0, franja(7, 15)] == 7 and matriz[2, franja(8, 30)] == 3
+    assert matriz.sum() == sum(fila[-1] for fila in FILAS)
+
+    # Un archivo ya ingerido no se vuelve a procesar
+    archivos = {nombre: os.stat(os.path.join(directorio_cache, nombre)).st_mtime_ns for nombre in os.listdir(directorio_cache)}
+    assert ingerir_csv(ruta, directorio_cache) == clave
+    assert archivos == {nombre: os.stat(os.path.join(directorio_cache, nombre)).st_mtime_ns
+                        for nombre in os.listdir(directorio_cache)}
+
+    perfiles, minuto_inicial = cargar_demanda("A", ruta, directorio_cache)
+    np.testing.assert_array_equal(perfiles["Peru"], matriz[1])
+    assert minuto_inicial == 7 * 60
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+import intensidad
+from red import red_subte, LINEAS
+
+
+def demanda_falsa(linea, tipo_dia=None):
+    """Datos solo para la línea B, con los nombres sin tildes y sin una estación"""
+    if linea != "B":
+        raise ValueError(f"No hay datos cargados para la línea {linea}")
+    nombres = [intensidad.normalizar_nombre(nombre).upper() for nombre in LINEAS["B"] if nombre != "Dorrego"]
+    return {nombre: np.ones(intensidad.FRANJAS_POR_DIA) for nombre in nombres}, 300
+
+
+def test_avisa_lineas_y_estaciones_sin_datos(monkeypatch):
+    monkeypatch.setattr(intensidad, "cargar_demanda", demanda_falsa)
+    red = red_subte(("A", "B"))
+    with pytest.warns(UserWarning) as avisos:
+        perfiles = intensidad.perfiles_estaciones(red.nombres, red.lineas)
+    mensajes = [str(aviso.message) for aviso in avisos]
+    assert any("línea A" in mensaje for mensaje in mensajes)
+    assert any("línea B" in mensaje and "Dorrego" in mensaje for mensaje in mensajes)
+
+    sin_demanda = {nombre for nombre, total in zip(red.nombres, perfiles.sum(axis=1)) if total == 0}
+    assert sin_demanda == set(LINEAS["A"]) | {"Dorrego"}
@@ -0,0 +1,30 @@
+import numpy as np
+
+from registro import RegistroAcotado
+
+HORAS = 26
+STEPS_POR_HORA = 4
+
+
+def test_registro_acotado_retiene_los_ultimos_steps_y_resume_por_hora_y_dia():
+    registro = RegistroAcotado(["Peru", "Lima"], capacidad=5, minuto_inicial=0, minutos_por_step=15, horas_resumen=3)
+    steps = HORAS * STEPS_POR_HORA
+    filas = np.stack([np.arange(steps), 2 * np.arange(steps)], axis=1)
+    for fila in filas:
+        registro.registrar(fila)
+
+    assert len(registro) == steps
+    assert registro.primer_step() == steps - 4
+    np.testing.assert_array_equal(registro.serie_completa(), filas[-5:])
+
+    # Solo quedan las últimas 3 horas cerradas más la que está en curso
+    horas = registro.resumen_horario()
+    ultimas = np.arange(HORAS - 4, HORAS)
+    np.testing.assert_array_equal(horas["inicio"], ultimas * 60)
+    np.testing.assert_array_equal(horas["media"][:, 0], STEPS_POR_HORA * ultimas + 1.5)
+    np.testing.assert_array_equal(horas["maximo"][:, 1], 2 * (STEPS_POR_HORA * ultimas + 3))
+
+    dias = registro.resumen_diario()
+    np.testing.assert_array_equal(dias["inicio"], [0, 24 * 60])
+    np.testing.assert_array_equal(dias["media"][:, 0], [filas[:96, 0].mean(), filas[96:, 0].mean()])
+    np.testing.assert_array_equal(dias["maximo"][:, 0], [95, steps - 1])
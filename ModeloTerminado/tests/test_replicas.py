@@ -0,0 +1,10 @@
+import numpy as np
+
+from replicas import ejecutar_replicas
+
+
+def test_replicas_no_dependen_de_los_procesos():
+    un_proceso = ejecutar_replicas(4, 11, 20, procesos=1)
+    dos_procesos = ejecutar_replicas(4, 11, 20, procesos=2)
+    np.testing.assert_array_equal(un_proceso["media"], dos_procesos["media"])
+    np.testing.assert_array_equal(un_proceso["varianza"], dos_procesos["varianza"])
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import numpy as np
+
+from transmision import ServidorTransmision, Suscriptor, POLITICA_BLOQUEAR, POLITICA_DESCARTAR
+
+
+class ModeloFalso:
+    nombres_estaciones = ["Peru", "Lima"]
+    minuto_inicial = 300
+    minutos_por_step = 5
+
+    def iter_steps(self, steps):
+        for step in range(1, steps + 1):
+            yield step, conteos(step)
+
+
+def conteos(step):
+    return np.array([step, 10 * step])
+
+
+def test_descartar_deja_los_registros_mas_nuevos():
+    async def prueba():
+        servidor = ServidorTransmision(ModeloFalso(), tamano_cola=2, politica=POLITICA_DESCARTAR)
+        suscriptor = Suscriptor(None, 2)
+        servidor.suscriptores.add(suscriptor)
+        for step in range(1, 6):
+            await servidor.publicar(step, conteos(step))
+        return suscriptor
+
+    suscriptor = asyncio.run(prueba())
+    assert suscriptor.descartados == 3
+    assert [json.loads(suscriptor.cola.get_nowait())[0] for _ in range(2)] == [4, 5]
+
+
+def test_bloquear_espera_lugar_en_la_cola():
+    async def prueba():
+        servidor = ServidorTransmision(ModeloFalso(), tamano_cola=2, politica=POLITICA_BLOQUEAR)
+        suscriptor = Suscriptor(None, 2)
+        servidor.suscriptores.add(suscriptor)
+        for step in (1, 2):
+            await servidor.publicar(step, conteos(step))
+        tercero = asyncio.ensure_future(servidor.publicar(3, conteos(3)))
+        await asyncio.sleep(0.05)
+        assert not tercero.done()
+        suscriptor.cola.get_nowait()
+        await tercero
+        return suscriptor
+
+    suscriptor = asyncio.run(prueba())
+    assert suscriptor.descartados == 0
+    assert [json.loads(suscriptor.cola.get_nowait())[0] for _ in range(2)] == [2, 3]
+
+
+def test_un_suscriptor_recibe_el_encabezado_y_todos_los_steps():
+    async def prueba():
+        servidor = ServidorTransmision(ModeloFalso(), puerto=0, tamano_cola=1, politica=POLITICA_BLOQUEAR)
+        await servidor.iniciar()
+        lector, escritor = await asyncio.open_connection("127.0.0.1", servidor.puerto)
+        await servidor.esperar_suscriptores(1)
+        await servidor.ejecutar(20)
+        await servidor.cerrar()
+        lineas = (await lector.read()).decode("utf-8").splitlines()
+        escritor.close()
+        return lineas
+
+    encabezado, *registros = asyncio.run(prueba())
+    assert json.loads(encabezado)["estaciones"] == ["Peru", "Lima"]
+    assert [json.loads(registro) for registro in registros] == [[step, step, 10 * step] for step in range(1, 21)]
@@ -0,0 +1,186 @@
+"""Transmisión en vivo de los conteos por estación a varios suscriptores.
+
+Servidor asyncio (solo biblioteca estándar) que escucha en un puerto TCP local
+o en un socket Unix. Cada suscriptor recibe líneas JSON: primero un encabezado
+
+    {"estaciones": [...], "minuto_inicial": 300, "minutos_por_step": 5}
+
+y después una línea por step con el número de step y los pasajeros de cada
+estación, en el orden del encabezado:
+
+    [1, 214, 87, ...]
+
+Cada suscriptor tiene una cola acotada. Si un suscriptor lento la llena:
+- "descartar": se descarta el registro más viejo de su cola (los demás no se enteran)
+- "bloquear": la simulación espera a que haya lugar
+
+La simulación corre en un hilo aparte (ver ModeloSubte.iter_steps), así que
+el servidor sigue atendiendo mientras se calcula cada step.
+
+Uso:
+    python -m transmision --steps 288 --puerto 8765 --politica descartar
+    nc 127.0.0.1 8765
+"""
+import argparse
+import asyncio
+import json
+
+POLITICA_DESCARTAR = "descartar"
+POLITICA_BLOQUEAR = "bloquear"
+TAMANO_COLA = 100
+PUERTO = 8765
+ESPERA_CIERRE = 5.0
+
+
+class Suscriptor:
+
+    def __init__(self, escritor, tamano_cola):
+        self.escritor = escritor
+        self.cola = asyncio.Queue(maxsize=tamano_cola)
+        self.descartados = 0
+
+
+class ServidorTransmision:
+    """Publica cada step de `modelo` a todos los suscriptores conectados.
+
+    ruta_socket: si se indica, escucha en ese socket Unix en lugar de host:puerto
+    politica: "descartar" o "bloquear" cuando la cola de un suscriptor está llena
+    """
+
+    def __init__(self, modelo, host="127.0.0.1", puerto=PUERTO, ruta_socket=None,
+                 tamano_cola=TAMANO_COLA, politica=POLITICA_DESCARTAR):
+        if politica not in (POLITICA_DESCARTAR, POLITICA_BLOQUEAR):
+            raise ValueError(f"Política desconocida: {politica}")
+        self.modelo = modelo
+        self.host = host
+        self.puerto = puerto
+        self.ruta_socket = ruta_socket
+        self.tamano_cola = tamano_cola
+        self.politica = politica
+        self.suscriptores = set()
+        self.servidor = None
+        self.encabezado = json.dumps({
+            "estaciones": list(modelo.nombres_estaciones),
+            "minuto_inicial": modelo.minuto_inicial,
+            "minutos_por_step": modelo.minutos_por_step,
+        }, ensure_ascii=False) + "\n"
+
+    async def iniciar(self):
+        if self.ruta_socket is not None:
+            self.servidor = await asyncio.start_unix_server(self._atender, path=self.ruta_socket)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+            # Con puerto 0 el sistema elige uno libre
+            self.puerto = self.servidor.sockets[0].getsockname()[1]
+
+    async def _atender(self, lector, escritor):
+        suscriptor = Suscriptor(escritor, self.tamano_cola)
+        self.suscriptores.add(suscriptor)
+        try:
+            escritor.write(self.encabezado.encode("utf-8"))
+            while True:
+                linea = await suscriptor.cola.get()
+                if linea is None:
+                    break
+                escritor.write(linea)
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.suscriptores.discard(suscriptor)
+            # Si la simulación estaba bloqueada esperando lugar en esta cola, se libera
+            while not suscriptor.cola.empty():
+                suscriptor.cola.get_nowait()
+            escritor.close()
+
+    async def _encolar(self, suscriptor, elemento):
+        if self.politica == POLITICA_BLOQUEAR:
+            await suscriptor.cola.put(elemento)
+            return
+        if suscriptor.cola.full():
+            suscriptor.cola.get_nowait()
+            suscriptor.descartados += 1
+        suscriptor.cola.put_nowait(elemento)
+
+    async def publicar(self, step, conteos):
+        linea = (json.dumps([step, *conteos.tolist()], separators=(",", ":")) + "\n").encode("utf-8")
+        for suscriptor in list(self.suscriptores):
+            await self._encolar(suscriptor, linea)
+
+    async def esperar_suscriptores(self, cantidad, intervalo=0.05):
+        while len(self.suscriptores) < cantidad:
+            await asyncio.sleep(intervalo)
+
+    async def ejecutar(self, steps=None, pausa=0.0):
+        """Simula y publica cada step; pausa son segundos de espera entre steps"""
+        loop = asyncio.get_running_loop()
+        iterador = self.modelo.iter_steps(steps)
+        terminado = object()
+        while True:
+            registro = await loop.run_in_executor(None, next, iterador, terminado)
+            if registro is terminado:
+                break
+            await self.publicar(*registro)
+            if pausa:
+                await asyncio.sleep(pausa)
+
+    async def _esperar_desconexion(self):
+        while self.suscriptores:
+            await asyncio.sleep(0.01)
+
+    async def _despedir(self):
+        for suscriptor in list(self.suscriptores):
+            await self._encolar(suscriptor, None)
+        await self._esperar_desconexion()
+
+    async def cerrar(self, espera=ESPERA_CIERRE):
+        """Avisa el fin a los suscriptores (después de lo que tengan en cola) y deja de escuchar.
+        Los que no terminan de recibir en `espera` segundos (por ejemplo, conectados pero sin
+        leer) se desconectan."""
+        try:
+            await asyncio.wait_for(self._despedir(), espera)
+        except asyncio.TimeoutError:
+            for suscriptor in list(self.suscriptores):
+                # Al cortar la conexión, _atender sale de drain() con ConnectionError
+                suscriptor.escritor.transport.abort()
+            try:
+                await asyncio.wait_for(self._esperar_desconexion(), espera)
+            except asyncio.TimeoutError:
+                self.suscriptores.clear()
+        self.servidor.close()
+        await self.servidor.wait_closed()
+
+
+async def transmitir(modelo, steps=None, suscriptores=0, pausa=0.0, **opciones):
+    """Levanta el servidor, espera a `suscriptores` conexiones y transmite la corrida"""
+    servidor = ServidorTransmision(modelo, **opciones)
+    await servidor.iniciar()
+    await servidor.esperar_suscriptores(suscriptores)
+    await servidor.ejecutar(steps, pausa)
+    await servidor.cerrar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="transmision", description="Transmite en vivo una simulación del Subte")
+    parser.add_argument("--steps", type=int, default=None, help="steps a simular; sin indicar no termina")
+    parser.add_argument("--modo", default="cohortes", choices=["agentes", "cohortes", "eventos"])
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--socket", default=None, help="socket Unix en lugar de host y puerto")
+    parser.add_argument("--cola", type=int, default=TAMANO_COLA, help="registros en cola por suscriptor")
+    parser.add_argument("--politica", default=POLITICA_DESCARTAR, choices=[POLITICA_DESCARTAR, POLITICA_BLOQUEAR])
+    parser.add_argument("--suscriptores", type=int, default=0, help="esperar esta cantidad de conexiones antes de empezar")
+    parser.add_argument("--pausa", type=float, default=0.0, help="segundos entre steps")
+    args = parser.parse_args(argv)
+
+    from Model import ModeloSubte
+
+    modelo = ModeloSubte(modo=args.modo, semilla=args.semilla)
+    asyncio.run(transmitir(modelo, args.steps, args.suscriptores, args.pausa, host=args.host, puerto=args.puerto,
+                           ruta_socket=args.socket, tamano_cola=args.cola, politica=args.politica))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())